@@ -9,6 +9,15 @@ from azure.identity import ClientSecretCredential
 from config import config
 from database import PipelineRun, db_manager
 
+# Mock pipeline runs: (run ID, pipeline, status, started ago, ended ago, error message)
+_MOCK_PIPELINE_RUNS = (
+    ("mock-run-001", "DataProcessingPipeline", "Failed", timedelta(minutes=30), timedelta(minutes=25),
+     "Activity 'CopyData' failed: The source database connection failed due to timeout. Error code: 40001"),
+    ("mock-run-002", "ETLPipeline", "Succeeded", timedelta(hours=1), timedelta(minutes=50), None),
+    ("mock-run-003", "DataValidationPipeline", "Failed", timedelta(minutes=15), timedelta(minutes=10),
+     "Validation failed: Missing required column 'customer_id' in source file. This is likely a data quality issue.")
+)
+
 class ADFClient:
     """Azure Data Factory REST API client"""
     
@@ -75,32 +84,18 @@ class ADFClient:
     def _get_mock_data(self, endpoint: str, method: str) -> Dict[str, Any]:
         """Generate mock data for testing"""
         if "pipelineruns" in endpoint and method == "GET":
+            now = datetime.now()
             return {
                 "value": [
                     {
-                        "runId": "mock-run-001",
-                        "pipelineName": "DataProcessingPipeline",
-                        "status": "Failed",
-                        "runStart": (datetime.now() - timedelta(minutes=30)).isoformat(),
-                        "runEnd": (datetime.now() - timedelta(minutes=25)).isoformat(),
-                        "message": "Activity 'CopyData' failed: The source database connection failed due to timeout. Error code: 40001"
-                    },
-                    {
-                        "runId": "mock-run-002", 
-                        "pipelineName": "ETLPipeline",
-                        "status": "Succeeded",
-                        "runStart": (datetime.now() - timedelta(hours=1)).isoformat(),
-                        "runEnd": (datetime.now() - timedelta(minutes=50)).isoformat(),
-                        "message": None
-                    },
-                    {
-                        "runId": "mock-run-003",
-                        "pipelineName": "DataValidationPipeline", 
-                        "status": "Failed",
-                        "runStart": (datetime.now() - timedelta(minutes=15)).isoformat(),
-                        "runEnd": (datetime.now() - timedelta(minutes=10)).isoformat(),
-                        "message": "Validation failed: Missing required column 'customer_id' in source file. This is likely a data quality issue."
+                        "runId": run_id,
+                        "pipelineName": pipeline_name,
+                        "status": status,
+                        "runStart": (now - started_ago).isoformat(),
+                        "runEnd": (now - ended_ago).isoformat(),
+                        "message": message
                     }
+                    for run_id, pipeline_name, status, started_ago, ended_ago, message in _MOCK_PIPELINE_RUNS
                 ]
             }
         elif "pipelineruns" in endpoint and method == "POST":
@@ -171,15 +166,16 @@ def get_adf_pipeline_status() -> List[PipelineRun]:
                     error_message=run_data.get("message"),
                     factory_name=config.azure.data_factory_name
                 )
-                
-                # Store in database
-                db_manager.insert_pipeline_run(pipeline_run)
                 pipeline_runs.append(pipeline_run)
                 
             except Exception as e:
                 print(f"Error processing pipeline run data: {e}")
                 continue
         
+        # Store in database in one transaction
+        if pipeline_runs:
+            db_manager.insert_pipeline_runs_bulk(pipeline_runs)
+        
         return pipeline_runs
         
     except Exception as e:
@@ -7,7 +7,7 @@ from datetime import datetime, timedelta
 from typing import List
 from config import config
 from adf_client import get_adf_pipeline_status, rerun_pipeline
-from genai_analyzer import analyze_failure_with_genai, should_rerun_pipeline, log_decision_and_action, GenAIAnalyzer
+from genai_analyzer import analyze_failure_with_genai, should_rerun_pipeline, log_decision_and_action, flush_monitoring_actions, GenAIAnalyzer
 from notification_service import notification_service
 from database import PipelineRun, db_manager
 
@@ -95,7 +95,8 @@ class ADFMonitoringSystem:
         print(f"\n🔍 Processing failed pipeline: {failed_run.pipeline_name} (Run ID: {failed_run.run_id})")
         
         try:
-            # Check if we've already processed this run
+            # Check if we've already processed this run (writing queued actions first)
+            flush_monitoring_actions()
             existing_actions = db_manager.get_retry_history(failed_run.pipeline_name, hours=1)
             if any(action.get('run_id') == failed_run.run_id for action in existing_actions):
                 print(f"ℹ️  Run {failed_run.run_id} already processed, skipping")
@@ -23,16 +23,17 @@ class Colors:
     BOLD = '\033[1m'
     END = '\033[0m'
 
+STATUS_PREFIXES = {
+    "success": f"{Colors.GREEN}✅",
+    "error": f"{Colors.RED}❌", 
+    "warning": f"{Colors.YELLOW}⚠️",
+    "info": f"{Colors.BLUE}ℹ️",
+    "check": f"{Colors.CYAN}🔍"
+}
+
 def print_status(message: str, status: str = "info"):
     """Print colored status messages"""
-    colors = {
-        "success": f"{Colors.GREEN}✅",
-        "error": f"{Colors.RED}❌", 
-        "warning": f"{Colors.YELLOW}⚠️",
-        "info": f"{Colors.BLUE}ℹ️",
-        "check": f"{Colors.CYAN}🔍"
-    }
-    print(f"{colors.get(status, colors['info'])} {message}{Colors.END}")
+    print(f"{STATUS_PREFIXES.get(status, STATUS_PREFIXES['info'])} {message}{Colors.END}")
 
 def check_file_exists(file_path: str) -> bool:
     """Check if a file exists"""
@@ -32,6 +32,15 @@ class MonitoringConfig:
     polling_interval_minutes: int = 5
     max_retry_attempts: int = 3
     retry_delay_minutes: int = 10
+    action_batch_size: int = 100
+    action_batch_delay_ms: int = 50
+    
+    def __post_init__(self):
+        # The action flusher drains up to this many per write; zero would never drain
+        if self.action_batch_size < 1:
+            raise ValueError(f"action_batch_size must be at least 1, got {self.action_batch_size}")
+        if self.action_batch_delay_ms < 0:
+            raise ValueError(f"action_batch_delay_ms must not be negative, got {self.action_batch_delay_ms}")
 
 @dataclass
 class NotificationConfig:
@@ -69,7 +78,9 @@ class Config:
         self.monitoring = MonitoringConfig(
             polling_interval_minutes=int(os.getenv("POLLING_INTERVAL_MINUTES", "5")),
             max_retry_attempts=int(os.getenv("MAX_RETRY_ATTEMPTS", "3")),
-            retry_delay_minutes=int(os.getenv("RETRY_DELAY_MINUTES", "10"))
+            retry_delay_minutes=int(os.getenv("RETRY_DELAY_MINUTES", "10")),
+            action_batch_size=int(os.getenv("ACTION_BATCH_SIZE", "100")),
+            action_batch_delay_ms=int(os.getenv("ACTION_BATCH_DELAY_MS", "50"))
         )
         
         self.notification = NotificationConfig(
@@ -35,11 +35,19 @@ class DatabaseManager:
     
     def __init__(self, db_path: str = None):
         self.db_path = db_path or config.database.database_path
+        # An in-memory database only lives as long as its connection, so keep one open
+        self._memory_conn = (
+            sqlite3.connect(self.db_path, check_same_thread=False) if self.db_path == ":memory:" else None
+        )
         self.init_database()
     
+    def _connect(self) -> sqlite3.Connection:
+        """Connection for one operation; the shared connection for in-memory databases"""
+        return self._memory_conn or sqlite3.connect(self.db_path)
+    
     def init_database(self):
         """Initialize database tables"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             
             # Pipeline runs table
@@ -87,7 +95,7 @@ class DatabaseManager:
     def insert_pipeline_run(self, pipeline_run: PipelineRun) -> bool:
         """Insert or update pipeline run"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     INSERT OR REPLACE INTO pipeline_runs 
@@ -108,10 +116,37 @@ class DatabaseManager:
             print(f"Error inserting pipeline run: {e}")
             return False
     
+    def insert_pipeline_runs_bulk(self, pipeline_runs: List[PipelineRun]) -> bool:
+        """Insert or update several pipeline runs in a single transaction"""
+        try:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.executemany('''
+                    INSERT OR REPLACE INTO pipeline_runs 
+                    (run_id, pipeline_name, status, start_time, end_time, error_message, factory_name)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', [
+                    (
+                        run.run_id,
+                        run.pipeline_name,
+                        run.status,
+                        run.start_time,
+                        run.end_time,
+                        run.error_message,
+                        run.factory_name
+                    )
+                    for run in pipeline_runs
+                ])
+                conn.commit()
+                return True
+        except Exception as e:
+            print(f"Error inserting pipeline runs: {e}")
+            return False
+    
     def insert_monitoring_action(self, action: MonitoringAction) -> bool:
         """Insert monitoring action"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     INSERT INTO monitoring_actions 
@@ -132,10 +167,37 @@ class DatabaseManager:
             print(f"Error inserting monitoring action: {e}")
             return False
     
+    def insert_monitoring_actions_bulk(self, actions: List[MonitoringAction]) -> bool:
+        """Insert several monitoring actions in a single transaction"""
+        try:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.executemany('''
+                    INSERT INTO monitoring_actions 
+                    (action_id, run_id, action_type, ai_analysis, decision_reason, action_taken, timestamp)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', [
+                    (
+                        action.action_id,
+                        action.run_id,
+                        action.action_type,
+                        action.ai_analysis,
+                        action.decision_reason,
+                        action.action_taken,
+                        action.timestamp
+                    )
+                    for action in actions
+                ])
+                conn.commit()
+                return True
+        except Exception as e:
+            print(f"Error inserting monitoring actions: {e}")
+            return False
+    
     def get_failed_runs_last_hours(self, hours: int = 24) -> List[Dict[str, Any]]:
         """Get failed pipeline runs from last N hours"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     SELECT * FROM pipeline_runs 
@@ -153,7 +215,7 @@ class DatabaseManager:
     def get_retry_history(self, pipeline_name: str, hours: int = 168) -> List[Dict[str, Any]]:
         """Get retry history for a pipeline (last week by default)"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     SELECT ma.*, pr.pipeline_name 
@@ -174,7 +236,7 @@ class DatabaseManager:
     def update_error_pattern_success_rate(self, error_pattern: str, success: bool):
         """Update success rate for error pattern"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 
                 # Check if pattern exists
@@ -204,7 +266,7 @@ class DatabaseManager:
     def get_dashboard_stats(self) -> Dict[str, Any]:
         """Get dashboard statistics"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 
                 stats = {}
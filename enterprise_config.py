@@ -3,13 +3,46 @@ Enterprise Configuration Management for ADF Monitor Pro
 Handles multiple environments, AI providers, and system settings
 """
 import os
+import sys
 import json
-import yaml
+import importlib.util
 from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, fields, MISSING
 from pathlib import Path
-import uuid
-from datetime import datetime
+import secrets
+
+def _lazy_import(name: str):
+    """Import a module that is only loaded on first attribute access"""
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+# PyYAML is only needed once a config file is actually read or written
+yaml = _lazy_import("yaml")
+
+def _build_from_dict(cls, defaults: Dict[str, Any], field_names: frozenset, data: Dict[str, Any]):
+    """Instantiate a dataclass from a dict with one __dict__ update instead of the generated __init__"""
+    unknown = data.keys() - field_names
+    if unknown:
+        raise TypeError(f"{cls.__name__} got unexpected fields: {', '.join(sorted(unknown))}")
+    missing = field_names - defaults.keys() - data.keys()
+    if missing:
+        raise TypeError(f"{cls.__name__} missing required fields: {', '.join(sorted(missing))}")
+    obj = cls.__new__(cls)
+    obj.__dict__.update(defaults | data)
+    return obj
+
+def _dataclass_defaults(cls) -> Dict[str, Any]:
+    """Collect the plain (non-factory) defaults of a dataclass"""
+    return {f.name: f.default for f in fields(cls) if f.default is not MISSING}
 
 @dataclass
 class EnvironmentConfig:
@@ -26,6 +59,10 @@ class EnvironmentConfig:
     polling_interval: int = 300  # seconds
     retry_attempts: int = 3
     
+    @classmethod
+    def _fast_from_dict(cls, data: Dict[str, Any]) -> "EnvironmentConfig":
+        return _build_from_dict(cls, _ENVIRONMENT_DEFAULTS, _ENVIRONMENT_FIELDS, data)
+    
     def to_dict(self) -> Dict[str, Any]:
         return {
             "name": self.name,
@@ -58,6 +95,10 @@ class AIProviderConfig:
     active: bool = True
     cost_per_1k_tokens: float = 0.03
     
+    @classmethod
+    def _fast_from_dict(cls, data: Dict[str, Any]) -> "AIProviderConfig":
+        return _build_from_dict(cls, _AI_PROVIDER_DEFAULTS, _AI_PROVIDER_FIELDS, data)
+    
     def to_dict(self) -> Dict[str, Any]:
         return {
             "provider_id": self.provider_id,
@@ -75,6 +116,11 @@ class AIProviderConfig:
             "cost_per_1k_tokens": self.cost_per_1k_tokens
         }
 
+_ENVIRONMENT_DEFAULTS = _dataclass_defaults(EnvironmentConfig)
+_ENVIRONMENT_FIELDS = frozenset(f.name for f in fields(EnvironmentConfig))
+_AI_PROVIDER_DEFAULTS = _dataclass_defaults(AIProviderConfig)
+_AI_PROVIDER_FIELDS = frozenset(f.name for f in fields(AIProviderConfig))
+
 @dataclass
 class NotificationConfig:
     """Configuration for notifications"""
@@ -260,11 +306,7 @@ class EnterpriseConfigManager:
         with open(self.environments_file, 'r') as f:
             data = yaml.safe_load(f)
         
-        environments = []
-        for env_data in data.get('environments', []):
-            environments.append(EnvironmentConfig(**env_data))
-        
-        return environments
+        return [EnvironmentConfig._fast_from_dict(env_data) for env_data in data.get('environments', [])]
     
     def add_environment(self, env_config: EnvironmentConfig) -> bool:
         """Add a new environment configuration"""
@@ -328,11 +370,7 @@ class EnterpriseConfigManager:
         with open(self.ai_providers_file, 'r') as f:
             data = yaml.safe_load(f)
         
-        providers = []
-        for provider_data in data.get('ai_providers', []):
-            providers.append(AIProviderConfig(**provider_data))
-        
-        return providers
+        return [AIProviderConfig._fast_from_dict(provider_data) for provider_data in data.get('ai_providers', [])]
     
     def add_ai_provider(self, provider_config: AIProviderConfig) -> bool:
         """Add a new AI provider configuration"""
@@ -382,6 +420,8 @@ class EnterpriseConfigManager:
     
     def export_configuration(self, export_path: str) -> bool:
         """Export all configurations to a single file"""
+        from datetime import datetime
+        
         try:
             export_data = {
                 "environments": [],
@@ -391,7 +431,7 @@ class EnterpriseConfigManager:
                 "export_metadata": {
                     "timestamp": str(datetime.now()),
                     "version": "2.0.0",
-                    "export_id": str(uuid.uuid4())
+                    "export_id": secrets.token_hex(16)
                 }
             }
             
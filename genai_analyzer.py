@@ -1,22 +1,146 @@
 """
 GenAI Analyzer for ADF Pipeline Failures
 """
-import openai
+import asyncio
+import atexit
+import hashlib
 import json
-from typing import Dict, Any, Optional, Tuple
+import os
+import queue
+import re
+import threading
+import time
 from datetime import datetime
+import orjson
+from cachetools import TTLCache
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from types import MappingProxyType
 from config import config
-from database import MonitoringAction, db_manager
-import uuid
+from database import DatabaseManager, MonitoringAction, db_manager
+
+# Volatile tokens (GUIDs, timestamps, run IDs) stripped before cache lookups, so
+# retries of the same failure share one analysis; error codes and other numbers
+# are kept because they distinguish failures
+_ERROR_NOISE = re.compile(
+    r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"
+    r"|\d{4}-\d{2}-\d{2}[t ]\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:z|[+-]\d{2}:?\d{2})?"
+    r"|\b\w+-run-\w+\b",
+    re.IGNORECASE
+)
+_WHITESPACE = re.compile(r"\s+")
+
+# Mock analysis templates, built once and copied per call
+_MOCK_TRANSIENT_ANALYSIS = MappingProxyType({
+    "success": True,
+    "analysis": {
+        "error_type": "transient",
+        "severity": "medium", 
+        "should_retry": True,
+        "retry_delay_minutes": 10,
+        "confidence_score": 85,
+        "analysis_summary": "Network/timeout error detected. This is typically a transient issue that resolves on retry.",
+        "root_cause": "Network connectivity or service timeout",
+        "recommended_actions": [
+            "Retry the pipeline",
+            "Monitor for pattern of network issues",
+            "Check service health status"
+        ],
+        "manual_intervention_required": False
+    },
+    "raw_response": "Mock analysis: Transient network error",
+    "run_id": "mock"
+})
+
+_MOCK_DATA_QUALITY_ANALYSIS = MappingProxyType({
+    "success": True,
+    "analysis": {
+        "error_type": "data_quality",
+        "severity": "high",
+        "should_retry": False,
+        "retry_delay_minutes": 0,
+        "confidence_score": 90,
+        "analysis_summary": "Data quality issue detected. Manual intervention required to fix data source.",
+        "root_cause": "Data schema or content validation failure",
+        "recommended_actions": [
+            "Review source data quality",
+            "Check data schema changes",
+            "Contact data provider",
+            "Update pipeline to handle schema changes"
+        ],
+        "manual_intervention_required": True
+    },
+    "raw_response": "Mock analysis: Data quality issue",
+    "run_id": "mock"
+})
+
+_MOCK_UNKNOWN_ANALYSIS = MappingProxyType({
+    "success": True,
+    "analysis": {
+        "error_type": "unknown",
+        "severity": "medium",
+        "should_retry": True,
+        "retry_delay_minutes": 15,
+        "confidence_score": 70,
+        "analysis_summary": "Unknown error type. Attempting retry with caution.",
+        "root_cause": "Unclear from error message",
+        "recommended_actions": [
+            "Retry once with monitoring",
+            "Review detailed activity logs", 
+            "Escalate if retry fails"
+        ],
+        "manual_intervention_required": False
+    },
+    "raw_response": "Mock analysis: Unknown error",
+    "run_id": "mock"
+})
+
+def _copy_analysis(analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy an analysis dict along with its list and dict values, so shared copies can't be mutated"""
+    return {
+        key: list(value) if isinstance(value, list) else dict(value) if isinstance(value, dict) else value
+        for key, value in analysis.items()
+    }
+
+# One case-insensitive scan classifies mock errors; each alternative is anchored
+# at the start, so transient keywords win over data quality ones as before
+_MOCK_CLASSIFIER = re.compile(
+    r"(?=.*?(?P<transient>timeout|connection|network))"
+    r"|(?=.*?(?P<data_quality>column|data|validation|schema))",
+    re.IGNORECASE | re.DOTALL
+)
+
+_MOCK_TEMPLATES = {
+    "transient": _MOCK_TRANSIENT_ANALYSIS,
+    "data_quality": _MOCK_DATA_QUALITY_ANALYSIS
+}
 
 class GenAIAnalyzer:
     """GenAI analyzer for pipeline failure analysis"""
     
+    ANALYSIS_CACHE_SIZE = 1024
+    ANALYSIS_CACHE_TTL_SECONDS = 900
+    MAX_CONCURRENT_REQUESTS = 10
+    MAX_ATTEMPTS = 3
+    RETRY_BACKOFF_SECONDS = 1
+    RETRY_BACKOFF_MAX_SECONDS = 30
+    
     def __init__(self):
         self.config = config.openai
+        # Repeated failures (e.g. one upstream outage) reuse the same analysis
+        self._analysis_cache = TTLCache(maxsize=self.ANALYSIS_CACHE_SIZE, ttl=self.ANALYSIS_CACHE_TTL_SECONDS)
+        self._cache_lock = threading.Lock()
         if self.config.api_key:
-            openai.api_key = self.config.api_key
+            # Imported here so mock-only runs never load the openai SDK
+            from openai import OpenAI, AsyncOpenAI, APIConnectionError, APITimeoutError, RateLimitError
+            
+            # One client per analyzer so the underlying HTTP connection pool is reused
+            self.client = OpenAI(api_key=self.config.api_key)
+            self.aclient = AsyncOpenAI(api_key=self.config.api_key)
+            self._retryable_errors = (RateLimitError, APITimeoutError, APIConnectionError)
         else:
+            self.client = None
+            self.aclient = None
+            self._retryable_errors = ()
             print("Warning: OpenAI API key not configured. Using mock analysis.")
     
     def analyze_failure_with_genai(self, pipeline_name: str, error_message: str, run_id: str) -> Dict[str, Any]:
@@ -27,6 +151,11 @@ class GenAIAnalyzer:
         if not self.config.api_key:
             return self._get_mock_analysis(error_message)
         
+        cache_key = self._cache_key(pipeline_name, error_message)
+        cached = self._get_cached_analysis(cache_key, run_id)
+        if cached:
+            return cached
+        
         try:
             # Get historical context
             retry_history = db_manager.get_retry_history(pipeline_name)
@@ -35,23 +164,112 @@ class GenAIAnalyzer:
             prompt = self._create_analysis_prompt(pipeline_name, error_message, retry_history)
             
             # Call OpenAI
-            response = openai.ChatCompletion.create(
+            response = self.client.chat.completions.create(
                 model=self.config.model,
-                messages=[
-                    {"role": "system", "content": "You are an expert Azure Data Factory DevOps engineer analyzing pipeline failures."},
-                    {"role": "user", "content": prompt}
-                ],
+                messages=self._build_messages(prompt),
                 max_tokens=self.config.max_tokens,
                 temperature=self.config.temperature
             )
             
             analysis_text = response.choices[0].message.content
-            return self._parse_analysis_response(analysis_text, run_id)
+            result = self._parse_analysis_response(analysis_text, run_id)
+            self._store_cached_analysis(cache_key, result)
+            return result
+            
+        except Exception as e:
+            print(f"Error in GenAI analysis: {e}")
+            return self._get_mock_analysis(error_message)
+    
+    async def analyze_failure_async(self, pipeline_name: str, error_message: str, run_id: str) -> Dict[str, Any]:
+        """Async variant of analyze_failure_with_genai using the shared async client"""
+        if not self.config.api_key:
+            return self._get_mock_analysis(error_message)
+        
+        cache_key = self._cache_key(pipeline_name, error_message)
+        cached = self._get_cached_analysis(cache_key, run_id)
+        if cached:
+            return cached
+        
+        try:
+            retry_history = db_manager.get_retry_history(pipeline_name)
+            prompt = self._create_analysis_prompt(pipeline_name, error_message, retry_history)
+            
+            response = await self._create_completion_async(self._build_messages(prompt))
+            
+            analysis_text = response.choices[0].message.content
+            result = self._parse_analysis_response(analysis_text, run_id)
+            self._store_cached_analysis(cache_key, result)
+            return result
             
         except Exception as e:
             print(f"Error in GenAI analysis: {e}")
             return self._get_mock_analysis(error_message)
     
+    async def _create_completion_async(self, messages: List[Dict[str, str]]):
+        """Request a completion, retrying rate limits and timeouts with exponential backoff"""
+        for attempt in range(self.MAX_ATTEMPTS):
+            try:
+                return await self.aclient.chat.completions.create(
+                    model=self.config.model,
+                    messages=messages,
+                    max_tokens=self.config.max_tokens,
+                    temperature=self.config.temperature
+                )
+            except self._retryable_errors:
+                if attempt == self.MAX_ATTEMPTS - 1:
+                    raise
+                await asyncio.sleep(min(self.RETRY_BACKOFF_SECONDS * 2 ** attempt, self.RETRY_BACKOFF_MAX_SECONDS))
+    
+    def analyze_batch(self, failures: Iterable[Tuple[str, str, str]]) -> List[Dict[str, Any]]:
+        """
+        Analyze several failures concurrently
+        Takes (pipeline_name, error_message, run_id) tuples, returns results in the same order
+        """
+        async def _gather():
+            # Bound in-flight requests so large batches don't trip rate limits
+            semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+            
+            async def _analyze(pipeline_name, error_message, run_id):
+                async with semaphore:
+                    return await self.analyze_failure_async(pipeline_name, error_message, run_id)
+            
+            return await asyncio.gather(*(
+                _analyze(pipeline_name, error_message, run_id)
+                for pipeline_name, error_message, run_id in failures
+            ))
+        
+        return list(asyncio.run(_gather()))
+    
+    def _cache_key(self, pipeline_name: str, error_message: str) -> Tuple[str, bytes]:
+        """Build analysis cache key from pipeline name and normalized error message digest"""
+        normalized = _WHITESPACE.sub(" ", _ERROR_NOISE.sub("#", error_message)).strip().lower()
+        return (pipeline_name, hashlib.blake2b(normalized.encode(), digest_size=16).digest())
+    
+    def _get_cached_analysis(self, cache_key: Tuple[str, bytes], run_id: str) -> Optional[Dict[str, Any]]:
+        """Return cached analysis for this run, if any"""
+        with self._cache_lock:
+            hit = self._analysis_cache.get(cache_key)
+        if hit is None:
+            return None
+        return {**hit, "analysis": _copy_analysis(hit.get("analysis", {})), "run_id": run_id}
+    
+    def _store_cached_analysis(self, cache_key: Tuple[str, bytes], result: Dict[str, Any]):
+        """Cache a successful analysis without its run-specific fields"""
+        if not result.get("success", False):
+            return
+        with self._cache_lock:
+            self._analysis_cache[cache_key] = {
+                **{k: v for k, v in result.items() if k != "run_id"},
+                "analysis": _copy_analysis(result.get("analysis", {}))
+            }
+    
+    def _build_messages(self, prompt: str) -> List[Dict[str, str]]:
+        """Build chat messages for the analysis prompt"""
+        return [
+            {"role": "system", "content": "You are an expert Azure Data Factory DevOps engineer analyzing pipeline failures."},
+            {"role": "user", "content": prompt}
+        ]
+    
     def _create_analysis_prompt(self, pipeline_name: str, error_message: str, retry_history: list) -> str:
         """Create analysis prompt for GenAI"""
         
@@ -59,7 +277,7 @@ class GenAIAnalyzer:
         if retry_history:
             retry_context = f"""
 Recent retry history for {pipeline_name}:
-{json.dumps(retry_history[-5:], indent=2, default=str)}
+{orjson.dumps(retry_history[-5:], default=str, option=orjson.OPT_INDENT_2).decode()}
 """
         
         prompt = f"""
@@ -158,72 +376,11 @@ Focus on actionable recommendations and accurate classification.
         """Generate mock analysis for testing"""
         
         # Simple rule-based mock analysis
-        error_lower = error_message.lower()
+        match = _MOCK_CLASSIFIER.match(error_message)
+        template = _MOCK_TEMPLATES[match.lastgroup] if match else _MOCK_UNKNOWN_ANALYSIS
         
-        if any(keyword in error_lower for keyword in ['timeout', 'connection', 'network']):
-            return {
-                "success": True,
-                "analysis": {
-                    "error_type": "transient",
-                    "severity": "medium", 
-                    "should_retry": True,
-                    "retry_delay_minutes": 10,
-                    "confidence_score": 85,
-                    "analysis_summary": "Network/timeout error detected. This is typically a transient issue that resolves on retry.",
-                    "root_cause": "Network connectivity or service timeout",
-                    "recommended_actions": [
-                        "Retry the pipeline",
-                        "Monitor for pattern of network issues",
-                        "Check service health status"
-                    ],
-                    "manual_intervention_required": False
-                },
-                "raw_response": "Mock analysis: Transient network error",
-                "run_id": "mock"
-            }
-        elif any(keyword in error_lower for keyword in ['column', 'data', 'validation', 'schema']):
-            return {
-                "success": True,
-                "analysis": {
-                    "error_type": "data_quality",
-                    "severity": "high",
-                    "should_retry": False,
-                    "retry_delay_minutes": 0,
-                    "confidence_score": 90,
-                    "analysis_summary": "Data quality issue detected. Manual intervention required to fix data source.",
-                    "root_cause": "Data schema or content validation failure",
-                    "recommended_actions": [
-                        "Review source data quality",
-                        "Check data schema changes",
-                        "Contact data provider",
-                        "Update pipeline to handle schema changes"
-                    ],
-                    "manual_intervention_required": True
-                },
-                "raw_response": "Mock analysis: Data quality issue",
-                "run_id": "mock"
-            }
-        else:
-            return {
-                "success": True,
-                "analysis": {
-                    "error_type": "unknown",
-                    "severity": "medium",
-                    "should_retry": True,
-                    "retry_delay_minutes": 15,
-                    "confidence_score": 70,
-                    "analysis_summary": "Unknown error type. Attempting retry with caution.",
-                    "root_cause": "Unclear from error message",
-                    "recommended_actions": [
-                        "Retry once with monitoring",
-                        "Review detailed activity logs", 
-                        "Escalate if retry fails"
-                    ],
-                    "manual_intervention_required": False
-                },
-                "raw_response": "Mock analysis: Unknown error",
-                "run_id": "mock"
-            }
+        # Copy so callers can't mutate the shared templates
+        return {**template, "analysis": _copy_analysis(template["analysis"])}
 
 def should_rerun_pipeline(analysis_result: Dict[str, Any], pipeline_name: str) -> Tuple[bool, str]:
     """
@@ -246,7 +403,8 @@ def should_rerun_pipeline(analysis_result: Dict[str, Any], pipeline_name: str) -
     if not should_retry:
         return False, f"AI recommendation: {analysis.get('analysis_summary', 'No retry recommended')}"
     
-    # Check retry history to prevent infinite loops
+    # Check retry history to prevent infinite loops (queued actions count too)
+    flush_monitoring_actions()
     recent_retries = db_manager.get_retry_history(pipeline_name, hours=24)
     if len(recent_retries) >= config.monitoring.max_retry_attempts:
         return False, f"Maximum retry attempts ({config.monitoring.max_retry_attempts}) reached in last 24 hours"
@@ -259,27 +417,103 @@ def should_rerun_pipeline(analysis_result: Dict[str, Any], pipeline_name: str) -
     # All checks passed
     return True, f"AI analysis suggests retry for {error_type} error (confidence: {confidence}%)"
 
-def log_decision_and_action(run_id: str, analysis_result: Dict[str, Any], action_taken: str, success: bool) -> str:
-    """Log the decision and action taken"""
-    
-    action_id = str(uuid.uuid4())
+# Monitoring actions are queued with their target database and written in
+# batches by a background flusher
+_action_queue: "queue.Queue[Tuple[DatabaseManager, MonitoringAction]]" = queue.Queue()
+_action_flusher: Optional[threading.Thread] = None
+_action_flusher_lock = threading.Lock()
+
+def _ensure_action_flusher():
+    """Start the background action flusher on first use"""
+    global _action_flusher
+    with _action_flusher_lock:
+        if _action_flusher is None:
+            _action_flusher = threading.Thread(
+                target=_action_flush_loop, name="monitoring-action-flusher", daemon=True
+            )
+            _action_flusher.start()
+            atexit.register(flush_monitoring_actions)
+
+def _drain_action_queue(batch: Optional[list] = None) -> List[Tuple[DatabaseManager, MonitoringAction]]:
+    """Pull queued actions until the batch is full or the queue is empty"""
+    batch = batch or []
+    while len(batch) < config.monitoring.action_batch_size:
+        try:
+            batch.append(_action_queue.get_nowait())
+        except queue.Empty:
+            break
+    return batch
+
+def _write_action_batch(batch: List[Tuple[DatabaseManager, MonitoringAction]]):
+    """Write a batch of actions, one bulk insert per database, and mark them done on the queue"""
+    try:
+        by_manager: Dict[DatabaseManager, List[MonitoringAction]] = {}
+        for manager, action in batch:
+            by_manager.setdefault(manager, []).append(action)
+        for manager, actions in by_manager.items():
+            manager.insert_monitoring_actions_bulk(actions)
+    finally:
+        for _ in batch:
+            _action_queue.task_done()
+
+def _action_flush_loop():
+    """Background loop: wait for an action, let a burst accumulate, then write it"""
+    while True:
+        batch = [_action_queue.get()]
+        # Every dequeued action must reach _write_action_batch (which marks it
+        # done), or flush_monitoring_actions() would wait on it forever
+        try:
+            time.sleep(config.monitoring.action_batch_delay_ms / 1000)
+            _drain_action_queue(batch)
+        except Exception as e:
+            print(f"Error batching monitoring actions: {e}")
+        try:
+            _write_action_batch(batch)
+        except Exception as e:
+            print(f"Error writing monitoring actions: {e}")
+
+def flush_monitoring_actions():
+    """Write all queued monitoring actions and wait for in-flight batches"""
+    batch = _drain_action_queue()
+    while batch:
+        _write_action_batch(batch)
+        batch = _drain_action_queue()
+    _action_queue.join()
+
+def _action_id_pool(batch_size: int = 256):
+    """Yield hex action IDs, drawing random bytes for a whole batch at once"""
+    while True:
+        buf = os.urandom(batch_size * 16)
+        for i in range(0, len(buf), 16):
+            yield buf[i:i + 16].hex()
+
+_action_ids = _action_id_pool()
+_action_ids_lock = threading.Lock()
+
+def log_decision_and_action(run_id: str, analysis_result: Dict[str, Any], action_taken: str, success: bool,
+                            manager: Optional[DatabaseManager] = None) -> str:
+    """Log the decision and action taken (to the global database unless a manager is given)"""
+    manager = manager or db_manager
+    with _action_ids_lock:
+        action_id = next(_action_ids)
     analysis = analysis_result.get("analysis", {})
     
     monitoring_action = MonitoringAction(
         action_id=action_id,
         run_id=run_id,
         action_type=action_taken,
-        ai_analysis=json.dumps(analysis),
+        ai_analysis=orjson.dumps(analysis).decode(),
         decision_reason=analysis.get("analysis_summary", "No analysis available"),
         action_taken=success,
         timestamp=datetime.now()
     )
     
-    db_manager.insert_monitoring_action(monitoring_action)
+    _ensure_action_flusher()
+    _action_queue.put((manager, monitoring_action))
     
     # Update error pattern success rate
     error_type = analysis.get("error_type", "unknown")
     if error_type != "unknown":
-        db_manager.update_error_pattern_success_rate(error_type, success)
+        manager.update_error_pattern_success_rate(error_type, success)
     
     return action_id
@@ -2,14 +2,107 @@
 Mock Data Generator for Testing ADF Monitoring System
 """
 import json
-import uuid
-from datetime import datetime, timedelta
-from typing import List, Dict, Any
-import random
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, List, Dict, Any
+import numpy as np
+
+# orjson is optional; fall back to the stdlib encoder when it isn't installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def _write_json(filename: str, data: Any, pretty: bool = False):
+    """Serialize to a single buffer and write it in one call"""
+    if ORJSON_AVAILABLE:
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else None))
+    else:
+        with open(filename, 'w') as f:
+            if pretty:
+                f.write(json.dumps(data, indent=2))
+            else:
+                f.write(json.dumps(data, separators=(',', ':')))
 
 class MockDataGenerator:
     """Generate mock data for testing the ADF monitoring system"""
     
+    # Runs are sampled in chunks of this size so streaming stays bounded in memory
+    RUN_CHUNK_SIZE = 10_000
+    
+    # Static GenAI analysis samples, built once per process
+    _GENAI_RESPONSES = {
+        "transient_network": {
+            "error_type": "transient",
+            "severity": "medium",
+            "should_retry": True,
+            "retry_delay_minutes": 10,
+            "confidence_score": 85,
+            "analysis_summary": "Network timeout detected. This is a transient connectivity issue that typically resolves on retry.",
+            "root_cause": "Temporary network connectivity or service availability issue",
+            "recommended_actions": [
+                "Retry the pipeline execution",
+                "Monitor network connectivity",
+                "Check Azure service health status",
+                "Consider increasing timeout values if pattern persists"
+            ],
+            "manual_intervention_required": False
+        },
+        "data_quality_schema": {
+            "error_type": "data_quality",
+            "severity": "high", 
+            "should_retry": False,
+            "retry_delay_minutes": 0,
+            "confidence_score": 92,
+            "analysis_summary": "Schema validation failure detected. Source data structure has changed and requires manual review.",
+            "root_cause": "Data schema mismatch or missing required columns",
+            "recommended_actions": [
+                "Review source data schema changes",
+                "Update pipeline to handle new schema",
+                "Contact data provider about schema changes",
+                "Implement schema evolution handling",
+                "Add data validation steps"
+            ],
+            "manual_intervention_required": True
+        },
+        "configuration_access": {
+            "error_type": "configuration",
+            "severity": "high",
+            "should_retry": False, 
+            "retry_delay_minutes": 0,
+            "confidence_score": 88,
+            "analysis_summary": "Access denied error indicates authentication or authorization configuration issue.",
+            "root_cause": "Invalid credentials or insufficient permissions",
+            "recommended_actions": [
+                "Verify service principal credentials",
+                "Check resource access permissions",
+                "Review connection string configuration",
+                "Validate storage account access rights",
+                "Update authentication settings"
+            ],
+            "manual_intervention_required": True
+        },
+        "unknown_error": {
+            "error_type": "unknown",
+            "severity": "medium",
+            "should_retry": True,
+            "retry_delay_minutes": 15,
+            "confidence_score": 65,
+            "analysis_summary": "Unable to classify error definitively. Recommending cautious retry with monitoring.",
+            "root_cause": "Error pattern not recognized in training data",
+            "recommended_actions": [
+                "Attempt one retry with careful monitoring",
+                "Review detailed activity logs",
+                "Check for similar patterns in history",
+                "Escalate to support if retry fails",
+                "Consider adding to error pattern training"
+            ],
+            "manual_intervention_required": False
+        }
+    }
+    
     def __init__(self):
         self.pipeline_names = [
             "DataProcessingPipeline",
@@ -49,121 +142,76 @@ class MockDataGenerator:
                 ]
             }
         ]
+        
+        # Flattened message pool so one index draw picks category and message together
+        self._error_messages = [
+            message for category in self.error_templates for message in category["messages"]
+        ]
     
     def generate_pipeline_runs(self, count: int = 10, failed_percentage: float = 0.3) -> List[Dict[str, Any]]:
         """Generate mock pipeline run data"""
-        runs = []
+        return list(self.iter_pipeline_runs(count, failed_percentage))
+    
+    def iter_pipeline_runs(self, count: int = 10, failed_percentage: float = 0.3) -> Iterator[Dict[str, Any]]:
+        """Yield mock pipeline runs, sampling randomness one chunk at a time"""
+        rng = np.random.default_rng()
+        error_messages = self._error_messages
+        now = np.datetime64(datetime.now(timezone.utc).replace(tzinfo=None), 's')
         
-        for i in range(count):
-            run_id = f"mock-run-{uuid.uuid4().hex[:8]}"
-            pipeline_name = random.choice(self.pipeline_names)
-            
-            # Determine if this run should be failed
-            is_failed = random.random() < failed_percentage
+        for chunk_start in range(0, count, self.RUN_CHUNK_SIZE):
+            n = min(self.RUN_CHUNK_SIZE, count - chunk_start)
             
-            start_time = datetime.now() - timedelta(
-                minutes=random.randint(5, 120),
-                seconds=random.randint(0, 59)
-            )
+            # Draw every random decision for the chunk up front
+            is_failed = rng.random(n) < failed_percentage
+            pipeline_idx = rng.integers(0, len(self.pipeline_names), n)
+            start_offsets = rng.integers(5, 121, n) * 60 + rng.integers(0, 60, n)  # seconds
+            durations = np.where(is_failed, rng.integers(1, 31, n), rng.integers(5, 61, n))  # minutes
+            error_idx = rng.integers(0, len(error_messages), n)
+            run_ids = rng.bytes(4 * n).hex()
             
-            if is_failed:
-                end_time = start_time + timedelta(minutes=random.randint(1, 30))
-                status = "Failed"
-                error_category = random.choice(self.error_templates)
-                error_message = random.choice(error_category["messages"])
-            else:
-                end_time = start_time + timedelta(minutes=random.randint(5, 60))
-                status = "Succeeded"
-                error_message = None
-            
-            run = {
-                "runId": run_id,
-                "pipelineName": pipeline_name,
-                "status": status,
-                "runStart": start_time.isoformat() + "Z",
-                "runEnd": end_time.isoformat() + "Z",
-                "message": error_message
-            }
+            # Format all UTC timestamps for the chunk in one vectorized pass
+            start_times = now - start_offsets.astype('timedelta64[s]')
+            end_times = start_times + (durations * 60).astype('timedelta64[s]')
+            run_starts = np.char.add(np.datetime_as_string(start_times, unit='s'), 'Z').tolist()
+            run_ends = np.char.add(np.datetime_as_string(end_times, unit='s'), 'Z').tolist()
             
-            runs.append(run)
+            for i, (failed, pipeline, error, run_start, run_end) in enumerate(zip(
+                is_failed.tolist(), pipeline_idx.tolist(), error_idx.tolist(), run_starts, run_ends
+            )):
+                yield {
+                    "runId": f"mock-run-{run_ids[8 * i:8 * i + 8]}",
+                    "pipelineName": self.pipeline_names[pipeline],
+                    "status": "Failed" if failed else "Succeeded",
+                    "runStart": run_start,
+                    "runEnd": run_end,
+                    "message": error_messages[error] if failed else None
+                }
+    
+    def save_mock_pipeline_runs_jsonl(self, filename: str, count: int, failed_percentage: float = 0.3) -> int:
+        """Stream mock pipeline runs to a JSON Lines file without holding them in memory"""
+        if ORJSON_AVAILABLE:
+            dumps = orjson.dumps
+        else:
+            dumps = lambda run: json.dumps(run, separators=(',', ':')).encode()
         
-        return runs
+        with open(filename, 'wb', buffering=8 * 1024 * 1024) as f:
+            for run in self.iter_pipeline_runs(count, failed_percentage):
+                f.write(dumps(run))
+                f.write(b"\n")
+        
+        print(f"Streamed {count} mock pipeline runs to {filename}")
+        return count
     
     def generate_mock_genai_responses(self) -> Dict[str, Dict[str, Any]]:
-        """Generate mock GenAI analysis responses for different error types"""
-        
+        """Generate mock GenAI analysis responses for different error types (a fresh copy per call)"""
+        # Per-entry copies (the only nested values are the action lists); far cheaper than deepcopy
         return {
-            "transient_network": {
-                "error_type": "transient",
-                "severity": "medium",
-                "should_retry": True,
-                "retry_delay_minutes": 10,
-                "confidence_score": 85,
-                "analysis_summary": "Network timeout detected. This is a transient connectivity issue that typically resolves on retry.",
-                "root_cause": "Temporary network connectivity or service availability issue",
-                "recommended_actions": [
-                    "Retry the pipeline execution",
-                    "Monitor network connectivity",
-                    "Check Azure service health status",
-                    "Consider increasing timeout values if pattern persists"
-                ],
-                "manual_intervention_required": False
-            },
-            "data_quality_schema": {
-                "error_type": "data_quality",
-                "severity": "high", 
-                "should_retry": False,
-                "retry_delay_minutes": 0,
-                "confidence_score": 92,
-                "analysis_summary": "Schema validation failure detected. Source data structure has changed and requires manual review.",
-                "root_cause": "Data schema mismatch or missing required columns",
-                "recommended_actions": [
-                    "Review source data schema changes",
-                    "Update pipeline to handle new schema",
-                    "Contact data provider about schema changes",
-                    "Implement schema evolution handling",
-                    "Add data validation steps"
-                ],
-                "manual_intervention_required": True
-            },
-            "configuration_access": {
-                "error_type": "configuration",
-                "severity": "high",
-                "should_retry": False, 
-                "retry_delay_minutes": 0,
-                "confidence_score": 88,
-                "analysis_summary": "Access denied error indicates authentication or authorization configuration issue.",
-                "root_cause": "Invalid credentials or insufficient permissions",
-                "recommended_actions": [
-                    "Verify service principal credentials",
-                    "Check resource access permissions",
-                    "Review connection string configuration",
-                    "Validate storage account access rights",
-                    "Update authentication settings"
-                ],
-                "manual_intervention_required": True
-            },
-            "unknown_error": {
-                "error_type": "unknown",
-                "severity": "medium",
-                "should_retry": True,
-                "retry_delay_minutes": 15,
-                "confidence_score": 65,
-                "analysis_summary": "Unable to classify error definitively. Recommending cautious retry with monitoring.",
-                "root_cause": "Error pattern not recognized in training data",
-                "recommended_actions": [
-                    "Attempt one retry with careful monitoring",
-                    "Review detailed activity logs",
-                    "Check for similar patterns in history",
-                    "Escalate to support if retry fails",
-                    "Consider adding to error pattern training"
-                ],
-                "manual_intervention_required": False
-            }
+            key: {**response, "recommended_actions": list(response["recommended_actions"])}
+            for key, response in self._GENAI_RESPONSES.items()
         }
     
-    def save_mock_data_to_file(self, filename: str = "mock_data.json"):
-        """Save mock data to JSON file for testing"""
+    def save_mock_data_to_file(self, filename: str = "mock_data.json", pretty: bool = False):
+        """Save mock data to JSON file for testing (compact unless pretty=True)"""
         
         mock_data = {
             "pipeline_runs": self.generate_pipeline_runs(20, 0.4),
@@ -171,16 +219,22 @@ class MockDataGenerator:
             "generated_at": datetime.now().isoformat()
         }
         
-        with open(filename, 'w') as f:
-            json.dump(mock_data, f, indent=2)
+        _write_json(filename, mock_data, pretty)
         
         print(f"Mock data saved to {filename}")
         return mock_data
 
+# Global mock data generator instance
+default_generator = MockDataGenerator()
+
 def create_test_scenario():
     """Create a specific test scenario with various failure types"""
     
-    generator = MockDataGenerator()
+    # Naive UTC, so the "Z" suffix below is accurate (matches iter_pipeline_runs)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    
+    def minutes_ago(minutes: int) -> str:
+        return f"{(now - timedelta(minutes=minutes)).isoformat()}Z"
     
     # Create specific test cases
     test_scenarios = [
@@ -188,24 +242,24 @@ def create_test_scenario():
             "runId": "test-transient-001",
             "pipelineName": "DataProcessingPipeline",
             "status": "Failed",
-            "runStart": (datetime.now() - timedelta(minutes=10)).isoformat() + "Z",
-            "runEnd": (datetime.now() - timedelta(minutes=5)).isoformat() + "Z",
+            "runStart": minutes_ago(10),
+            "runEnd": minutes_ago(5),
             "message": "Activity 'CopyData' failed: The source database connection failed due to timeout. Error code: 40001"
         },
         {
             "runId": "test-data-quality-001", 
             "pipelineName": "ETLPipeline",
             "status": "Failed",
-            "runStart": (datetime.now() - timedelta(minutes=20)).isoformat() + "Z",
-            "runEnd": (datetime.now() - timedelta(minutes=15)).isoformat() + "Z",
+            "runStart": minutes_ago(20),
+            "runEnd": minutes_ago(15),
             "message": "Validation failed: Missing required column 'customer_id' in source file. This is likely a data quality issue."
         },
         {
             "runId": "test-config-001",
             "pipelineName": "CustomerDataPipeline", 
             "status": "Failed",
-            "runStart": (datetime.now() - timedelta(minutes=30)).isoformat() + "Z",
-            "runEnd": (datetime.now() - timedelta(minutes=25)).isoformat() + "Z",
+            "runStart": minutes_ago(30),
+            "runEnd": minutes_ago(25),
             "message": "Access denied: Insufficient permissions to read from storage account 'customerdata'"
         }
     ]
@@ -213,15 +267,12 @@ def create_test_scenario():
     return test_scenarios
 
 if __name__ == "__main__":
-    generator = MockDataGenerator()
-    
     # Generate and save mock data
-    mock_data = generator.save_mock_data_to_file("mock_data.json")
+    mock_data = default_generator.save_mock_data_to_file("mock_data.json", pretty="--pretty" in sys.argv)
     
     # Create test scenarios
     test_data = create_test_scenario()
-    with open("test_scenarios.json", 'w') as f:
-        json.dump(test_data, f, indent=2)
+    _write_json("test_scenarios.json", test_data, pretty="--pretty" in sys.argv)
     
     print(f"Generated {len(mock_data['pipeline_runs'])} mock pipeline runs")
     print(f"Generated {len(test_data)} test scenarios")
@@ -1,20 +1,72 @@
 """
 Notification Service for ADF Monitoring System
 """
-import smtplib
-import requests
+import atexit
+import sys
+import threading
 import json
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Any, List, Optional
 from config import config
 
+# orjson is optional; fall back to requests' own JSON encoding without it
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 class NotificationService:
     """Handles notifications via console, Teams, and email"""
     
+    # Alerts arriving within this window share one Teams card / email
+    ALERT_BATCH_WINDOW_SECONDS = 1.0
+    
+    # Error messages longer than this are truncated in failure alerts
+    MAX_ERROR_MESSAGE_LENGTH = 500
+    
+    # Static Teams message card pieces
+    _TEAMS_COLOR_MAP = MappingProxyType({
+        "failure": "FF0000",  # Red
+        "retry": "FFA500",    # Orange  
+        "success": "00FF00",  # Green
+        "warning": "FFFF00"   # Yellow
+    })
+    _TEAMS_DEFAULT_COLOR = "0078D4"  # Blue
+    # Most severe first; a batch is colored and titled by its worst alert
+    _ALERT_SEVERITY = ("failure", "warning", "retry", "success")
+    _TEAMS_CARD_BASE = MappingProxyType({
+        "@type": "MessageCard",
+        "@context": "http://schema.org/extensions"
+    })
+    
     def __init__(self):
         self.config = config.notification
+        # Channel configuration is fixed for the life of the service
+        self._teams_enabled = bool(self.config.teams_webhook_url)
+        self._email_enabled = all([self.config.email_smtp_server, self.config.email_from, self.config.email_to])
+        # Keep-alive session so bursts of Teams alerts reuse one TLS connection;
+        # created on first use so console-only setups never import requests
+        self._session = None
+        self._session_lock = threading.Lock()
+        
+        # Cached SMTP connection, opened on first email and closed at exit
+        self._smtp = None
+        self._smtp_lock = threading.Lock()
+        atexit.register(self._close_smtp)
+        
+        # Network channels are dispatched in parallel; drain them before exit
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="notification")
+        atexit.register(self._pool.shutdown, wait=True)
+        
+        # Pending Teams/email alerts, flushed by a debounce timer
+        self._pending_alerts: deque = deque()
+        self._pending_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+        atexit.register(self.flush_pending_alerts)
     
     def send_alert(self, alert_type: str, pipeline_name: str, message: str, details: Optional[Dict[str, Any]] = None):
         """Send alert via all configured channels"""
@@ -30,86 +82,115 @@ class NotificationService:
         # Always send to console
         self._send_console_alert(alert_data)
         
-        # Send to Teams if configured
-        if self.config.teams_webhook_url:
-            self._send_teams_alert(alert_data)
+        # Queue for Teams/email so a burst of alerts goes out as one message
+        if self._teams_enabled or self._email_enabled:
+            with self._pending_lock:
+                self._pending_alerts.append(alert_data)
+                if self._flush_timer is None:
+                    self._flush_timer = threading.Timer(self.ALERT_BATCH_WINDOW_SECONDS, self.flush_pending_alerts)
+                    self._flush_timer.daemon = True
+                    self._flush_timer.start()
+    
+    def send_alerts_batch(self, alerts: List[Dict[str, Any]]):
+        """Send several alerts as a single Teams card and a single email"""
+        if not alerts:
+            return
+        
+        # Send Teams and email in the background so their network waits overlap
+        if self._teams_enabled:
+            self._dispatch(self._send_teams_alert, alerts)
         
-        # Send email if configured
-        if all([self.config.email_smtp_server, self.config.email_from, self.config.email_to]):
-            self._send_email_alert(alert_data)
+        if self._email_enabled:
+            self._dispatch(self._send_email_alert, alerts)
+    
+    def flush_pending_alerts(self):
+        """Send all queued Teams/email alerts now"""
+        with self._pending_lock:
+            alerts = list(self._pending_alerts)
+            self._pending_alerts.clear()
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+        
+        self.send_alerts_batch(alerts)
+    
+    def _dispatch(self, fn, *args):
+        """Run a network send on the pool, or inline once the pool has shut down"""
+        try:
+            self._pool.submit(fn, *args)
+        except RuntimeError:
+            fn(*args)
+    
+    def _batch_type(self, alerts: List[Dict[str, Any]]) -> str:
+        """Return the most severe alert type in a batch"""
+        def rank(alert_type: str) -> int:
+            if alert_type in self._ALERT_SEVERITY:
+                return self._ALERT_SEVERITY.index(alert_type)
+            return len(self._ALERT_SEVERITY)
+        
+        return min((alert_data['type'] for alert_data in alerts), key=rank)
     
     def _send_console_alert(self, alert_data: Dict[str, Any]):
         """Send alert to console"""
-        print("\n" + "="*80)
-        print(f"🚨 ADF ALERT: {alert_data['type'].upper()}")
-        print("="*80)
-        print(f"⏰ Time: {alert_data['timestamp']}")
-        print(f"📊 Pipeline: {alert_data['pipeline']}")
-        print(f"💬 Message: {alert_data['message']}")
+        # Build the whole block first so it reaches stdout in a single write
+        separator = "=" * 80
+        lines = [
+            "",
+            separator,
+            f"🚨 ADF ALERT: {alert_data['type'].upper()}",
+            separator,
+            f"⏰ Time: {alert_data['timestamp']}",
+            f"📊 Pipeline: {alert_data['pipeline']}",
+            f"💬 Message: {alert_data['message']}"
+        ]
         
         if alert_data['details']:
-            print("\n📋 Details:")
+            lines.append("\n📋 Details:")
             for key, value in alert_data['details'].items():
                 if isinstance(value, dict):
-                    print(f"  {key}:")
+                    lines.append(f"  {key}:")
                     for sub_key, sub_value in value.items():
-                        print(f"    {sub_key}: {sub_value}")
+                        lines.append(f"    {sub_key}: {sub_value}")
                 else:
-                    print(f"  {key}: {value}")
+                    lines.append(f"  {key}: {value}")
         
-        print("="*80 + "\n")
+        lines.append(separator + "\n")
+        sys.stdout.write("\n".join(lines) + "\n")
     
-    def _send_teams_alert(self, alert_data: Dict[str, Any]):
-        """Send alert to Microsoft Teams"""
+    def _send_teams_alert(self, alerts: List[Dict[str, Any]]):
+        """Send alerts to Microsoft Teams as one message card"""
+        import requests
+        
         try:
-            # Determine alert color
-            color_map = {
-                "failure": "FF0000",  # Red
-                "retry": "FFA500",    # Orange  
-                "success": "00FF00",  # Green
-                "warning": "FFFF00"   # Yellow
-            }
+            color = self._TEAMS_COLOR_MAP.get(self._batch_type(alerts), self._TEAMS_DEFAULT_COLOR)
             
-            color = color_map.get(alert_data['type'], "0078D4")  # Default blue
+            if len(alerts) == 1:
+                summary = f"ADF Alert: {alerts[0]['pipeline']}"
+            else:
+                summary = f"ADF Alerts: {len(alerts)} pipeline alerts"
             
             # Create Teams message
             teams_message = {
-                "@type": "MessageCard",
-                "@context": "http://schema.org/extensions",
+                **self._TEAMS_CARD_BASE,
                 "themeColor": color,
-                "summary": f"ADF Alert: {alert_data['pipeline']}",
-                "sections": [
-                    {
-                        "activityTitle": f"🚨 ADF {alert_data['type'].title()} Alert",
-                        "activitySubtitle": alert_data['pipeline'],
-                        "facts": [
-                            {"name": "Time", "value": alert_data['timestamp']},
-                            {"name": "Pipeline", "value": alert_data['pipeline']},
-                            {"name": "Message", "value": alert_data['message']}
-                        ]
-                    }
-                ]
+                "summary": summary,
+                "sections": [section for alert_data in alerts for section in self._build_teams_sections(alert_data)]
             }
             
-            # Add details if available
-            if alert_data['details']:
-                detail_facts = []
-                for key, value in alert_data['details'].items():
-                    if not isinstance(value, dict):
-                        detail_facts.append({"name": key, "value": str(value)})
-                
-                if detail_facts:
-                    teams_message['sections'].append({
-                        "activityTitle": "Additional Details",
-                        "facts": detail_facts
-                    })
-            
             # Send to Teams
-            response = requests.post(
-                self.config.teams_webhook_url,
-                json=teams_message,
-                timeout=30
-            )
+            if ORJSON_AVAILABLE:
+                response = self._get_session().post(
+                    self.config.teams_webhook_url,
+                    data=orjson.dumps(teams_message),
+                    headers={"Content-Type": "application/json"},
+                    timeout=30
+                )
+            else:
+                response = self._get_session().post(
+                    self.config.teams_webhook_url,
+                    json=teams_message,
+                    timeout=30
+                )
             response.raise_for_status()
             print(f"✅ Teams notification sent successfully")
             
@@ -118,47 +199,75 @@ class NotificationService:
         except Exception as e:
             print(f"❌ Error sending Teams notification: {e}")
     
-    def _send_email_alert(self, alert_data: Dict[str, Any]):
-        """Send alert via email"""
+    def _get_session(self):
+        """Return the shared Teams HTTP session, creating it on first use"""
+        with self._session_lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                
+                self._session = requests.Session()
+                self._session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+            return self._session
+    
+    def _build_teams_sections(self, alert_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Build the message card sections for one alert"""
+        sections = [
+            {
+                "activityTitle": f"🚨 ADF {alert_data['type'].title()} Alert",
+                "activitySubtitle": alert_data['pipeline'],
+                "facts": [
+                    {"name": "Time", "value": alert_data['timestamp']},
+                    {"name": "Pipeline", "value": alert_data['pipeline']},
+                    {"name": "Message", "value": alert_data['message']}
+                ]
+            }
+        ]
+        
+        # Add details if available
+        if alert_data['details']:
+            detail_facts = []
+            for key, value in alert_data['details'].items():
+                if not isinstance(value, dict):
+                    detail_facts.append({"name": key, "value": str(value)})
+            
+            if detail_facts:
+                sections.append({
+                    "activityTitle": "Additional Details",
+                    "facts": detail_facts
+                })
+        
+        return sections
+    
+    def _send_email_alert(self, alerts: List[Dict[str, Any]]):
+        """Send alerts via a single email"""
+        import smtplib
+        from email.mime.text import MIMEText
+        from email.mime.multipart import MIMEMultipart
+        
         try:
             # Create email message
             msg = MIMEMultipart()
             msg['From'] = self.config.email_from
             msg['To'] = self.config.email_to
-            msg['Subject'] = f"ADF Alert: {alert_data['type'].title()} - {alert_data['pipeline']}"
+            if len(alerts) == 1:
+                msg['Subject'] = f"ADF Alert: {alerts[0]['type'].title()} - {alerts[0]['pipeline']}"
+            else:
+                msg['Subject'] = f"ADF Alerts: {self._batch_type(alerts).title()} - {len(alerts)} pipeline alerts"
             
-            # Create email body
-            body = f"""
-ADF Monitoring Alert
-
-Type: {alert_data['type'].title()}
-Pipeline: {alert_data['pipeline']}
-Time: {alert_data['timestamp']}
-
-Message:
-{alert_data['message']}
-"""
-            
-            if alert_data['details']:
-                body += "\n\nDetails:\n"
-                for key, value in alert_data['details'].items():
-                    if isinstance(value, dict):
-                        body += f"\n{key}:\n"
-                        for sub_key, sub_value in value.items():
-                            body += f"  {sub_key}: {sub_value}\n"
-                    else:
-                        body += f"{key}: {value}\n"
-            
-            body += "\n\n---\nGenerated by ADF Monitoring & Automation System"
+            blocks = [self._build_email_body(alert_data) for alert_data in alerts]
+            blocks.append("\n---\nGenerated by ADF Monitoring & Automation System")
+            body = "\n".join(blocks)
             
             msg.attach(MIMEText(body, 'plain'))
             
-            # Send email
-            with smtplib.SMTP(self.config.email_smtp_server, self.config.email_smtp_port) as server:
-                server.starttls()
-                if self.config.email_password:
-                    server.login(self.config.email_from, self.config.email_password)
-                server.send_message(msg)
+            # Send email over the cached connection, reconnecting once if it dropped
+            with self._smtp_lock:
+                try:
+                    self._get_smtp().send_message(msg)
+                except smtplib.SMTPServerDisconnected:
+                    self._close_smtp()
+                    self._get_smtp().send_message(msg)
             
             print(f"✅ Email notification sent successfully")
             
@@ -167,11 +276,71 @@ Message:
         except Exception as e:
             print(f"❌ Error sending email notification: {e}")
     
+    def _build_email_body(self, alert_data: Dict[str, Any]) -> str:
+        """Build the email text block for one alert"""
+        parts = [f"""
+ADF Monitoring Alert
+
+Type: {alert_data['type'].title()}
+Pipeline: {alert_data['pipeline']}
+Time: {alert_data['timestamp']}
+
+Message:
+{alert_data['message']}
+"""]
+        
+        if alert_data['details']:
+            parts.append("\n\nDetails:\n")
+            for key, value in alert_data['details'].items():
+                if isinstance(value, dict):
+                    parts.append(f"\n{key}:\n")
+                    for sub_key, sub_value in value.items():
+                        parts.append(f"  {sub_key}: {sub_value}\n")
+                else:
+                    parts.append(f"{key}: {value}\n")
+        
+        return "".join(parts)
+    
+    def _get_smtp(self):
+        """Return a live SMTP connection, opening a new one if needed"""
+        import smtplib
+        
+        if self._smtp is not None:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._close_smtp()
+        
+        server = smtplib.SMTP(self.config.email_smtp_server, self.config.email_smtp_port)
+        server.starttls()
+        if self.config.email_password:
+            server.login(self.config.email_from, self.config.email_password)
+        self._smtp = server
+        return server
+    
+    def _close_smtp(self):
+        """Close the cached SMTP connection"""
+        if self._smtp is None:
+            return
+        
+        import smtplib
+        
+        try:
+            self._smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+        self._smtp = None
+    
     def send_failure_alert(self, pipeline_name: str, run_id: str, error_message: str, analysis: Optional[Dict] = None):
         """Send pipeline failure alert"""
         details = {
             "run_id": run_id,
-            "error_message": error_message[:500] + "..." if len(error_message) > 500 else error_message
+            "error_message": (
+                error_message if len(error_message) <= self.MAX_ERROR_MESSAGE_LENGTH
+                else f"{error_message[:self.MAX_ERROR_MESSAGE_LENGTH]}..."
+            )
         }
         
         if analysis:
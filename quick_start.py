@@ -3,24 +3,24 @@ Quick Start Script for ADF Monitoring System
 """
 import os
 import sys
+from importlib.util import find_spec
 from pathlib import Path
 
 def check_dependencies():
     """Check if required dependencies are installed"""
-    required_packages = [
-        'requests',
-        'openai', 
-        'python-dotenv',
-        'schedule'
-    ]
-    
-    missing_packages = []
+    # pip package name -> importable module name
+    required_packages = {
+        'requests': 'requests',
+        'openai': 'openai',
+        'python-dotenv': 'dotenv',
+        'schedule': 'schedule'
+    }
     
-    for package in required_packages:
-        try:
-            __import__(package.replace('-', '_'))
-        except ImportError:
-            missing_packages.append(package)
+    # find_spec only locates the module, it doesn't execute it
+    missing_packages = [
+        package for package, module in required_packages.items()
+        if find_spec(module) is None
+    ]
     
     if missing_packages:
         print("❌ Missing required packages:")
@@ -72,9 +72,8 @@ def generate_mock_data():
     print("🎭 Generating mock data...")
     
     try:
-        from mock_data import MockDataGenerator
-        generator = MockDataGenerator()
-        generator.save_mock_data_to_file("mock_data.json")
+        from mock_data import default_generator
+        default_generator.save_mock_data_to_file("mock_data.json")
         print("✅ Mock data generated successfully")
         return True
     except Exception as e:
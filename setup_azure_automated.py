@@ -4,48 +4,396 @@ Automates the Azure service principal and resource setup process
 """
 import os
 import sys
+import shlex
+import shutil
 import subprocess
+import tempfile
 import json
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from pathlib import Path
 
-def run_azure_cli_command(command, description=""):
-    """Run Azure CLI command and return result"""
+# orjson is optional; fall back to the stdlib parser when it isn't installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+DATA_FACTORY_LIST_COMMAND = ["az", "datafactory", "list", "--query", "[].{name:name, resourceGroup:resourceGroup, location:location}", "-o", "json"]
+
+# Resolved once so each call execs az directly instead of going through a shell
+AZ_EXECUTABLE = shutil.which("az") or "az"
+
+# Filled from the `az account show` precheck so later steps don't re-query it
+_SUBSCRIPTION_ID = None
+
+# Successful read-only checks are remembered between runs of the script
+CACHE_FILE = os.path.expanduser("~/.aims_setup_cache.json")
+CACHE_TTLS = {
+    "az --version": 3600,
+    "az account show": 300
+}
+_cache_lock = threading.Lock()
+
+# Static console text, written in one call each
+_BAR = "=" * 60
+
+SETUP_BANNER = f"""🚀 Azure ADF Monitoring Setup Automation
+{_BAR}
+This script will:
+1. Check Azure CLI setup
+2. Create/verify resource group
+3. Create service principal for ADF access
+4. Deploy Azure OpenAI service
+5. Create model deployments
+6. Generate configuration files
+7. Validate connections
+{_BAR}
+"""
+
+SETUP_COMPLETE_SUMMARY = f"""
+{_BAR}
+🎉 SETUP COMPLETED SUCCESSFULLY!
+{_BAR}
+✅ Service Principal created
+✅ Azure OpenAI deployed
+✅ Configuration files generated
+✅ Environment variables set
+
+📋 NEXT STEPS:
+1. Run: python test_adf_connection.py
+2. Run: python test_openai_connection.py
+3. Run: python startup.py webapp
+4. Open: http://localhost:8502
+
+🔐 SECURITY NOTES:
+- Your service principal credentials are in .env
+- Keep these credentials secure and never commit to git
+- Consider using Azure Key Vault for production
+
+💰 COST CONSIDERATIONS:
+- Azure OpenAI has usage-based pricing
+- Monitor usage in Azure portal
+- Set up billing alerts if needed
+"""
+
+# Configuration file templates, filled in with str.format where needed
+ENV_FILE_TEMPLATE = """# Azure Service Principal Configuration
+AZURE_CLIENT_ID={client_id}
+AZURE_CLIENT_SECRET={client_secret}
+AZURE_TENANT_ID={tenant_id}
+AZURE_SUBSCRIPTION_ID={subscription_id}
+
+# Azure OpenAI Configuration
+AZURE_OPENAI_ENDPOINT={endpoint}
+AZURE_OPENAI_API_KEY={api_key}
+AZURE_OPENAI_DEPLOYMENT_NAME={deployment_name}
+AZURE_OPENAI_API_VERSION=2024-02-15-preview
+
+# Application Configuration
+USE_AZURE_OPENAI=true
+ADF_MONITORING_ENABLED=true
+LOG_LEVEL=INFO
+
+# Web Application
+STREAMLIT_HOST=0.0.0.0
+STREAMLIT_PORT=8502
+
+# Generated on: {generated_at}
+"""
+
+ENVIRONMENTS_YAML = """environments:
+  production:
+    name: "Production"
+    description: "Live Azure Data Factory monitoring"
+    azure_tenant_id: "${AZURE_TENANT_ID}"
+    azure_subscription_id: "${AZURE_SUBSCRIPTION_ID}"
+    azure_client_id: "${AZURE_CLIENT_ID}"
+    azure_client_secret: "${AZURE_CLIENT_SECRET}"
+    monitoring_enabled: true
+    log_level: "INFO"
+    refresh_interval: 300
+    ai_analysis_enabled: true
+    
+  staging:
+    name: "Staging"
+    description: "Pre-production testing"
+    azure_tenant_id: "${AZURE_TENANT_ID}"
+    azure_subscription_id: "${AZURE_SUBSCRIPTION_ID}"
+    azure_client_id: "${AZURE_CLIENT_ID}"
+    azure_client_secret: "${AZURE_CLIENT_SECRET}"
+    monitoring_enabled: true
+    log_level: "DEBUG"
+    refresh_interval: 60
+    ai_analysis_enabled: true
+    
+  development:
+    name: "Development"
+    description: "Local development and testing"
+    monitoring_enabled: false
+    log_level: "DEBUG"
+    refresh_interval: 30
+    ai_analysis_enabled: true
+"""
+
+AI_PROVIDERS_YAML_TEMPLATE = """ai_providers:
+  - provider_id: "azure-openai-production"
+    provider_name: "Azure OpenAI (Production)"
+    provider_class: "OpenAIProvider"
+    model_name: "{deployment_name}"
+    api_endpoint: "{endpoint}"
+    api_key: "${{AZURE_OPENAI_API_KEY}}"
+    api_version: "2024-02-15-preview"
+    temperature: 0.3
+    max_tokens: 1000
+    top_p: 0.9
+    frequency_penalty: 0.0
+    confidence_threshold: 75
+    retry_confidence: 80
+    active: true
+    cost_per_1k_tokens: 0.02
+    
+  - provider_id: "azure-openai-backup"
+    provider_name: "Azure OpenAI (Backup)"
+    provider_class: "OpenAIProvider"
+    model_name: "gpt-35-turbo-deployment"
+    api_endpoint: "{endpoint}"
+    api_key: "${{AZURE_OPENAI_API_KEY}}"
+    api_version: "2024-02-15-preview"
+    temperature: 0.3
+    max_tokens: 800
+    confidence_threshold: 70
+    active: false
+    cost_per_1k_tokens: 0.001
+"""
+
+def _cache_enabled():
+    return os.getenv("AIMS_SETUP_NO_CACHE") != "1"
+
+def _az_profile_stamp():
+    """Identify the active az profile; `az login` and `az account set` rewrite this file"""
+    profile = Path(os.getenv("AZURE_CONFIG_DIR", os.path.expanduser("~/.azure"))) / "azureProfile.json"
+    try:
+        stat = profile.stat()
+    except OSError:
+        return "no-profile"
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+def _load_cache():
+    """Load the setup cache, treating a missing or corrupt file as empty"""
+    try:
+        with open(CACHE_FILE, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_cache(cache):
+    try:
+        with open(CACHE_FILE, "w") as f:
+            json.dump(cache, f)
+    except OSError as e:
+        print(f"   ⚠️ Could not write setup cache: {e}")
+
+def run_azure_cli_command(argv, description="", cache=False, expect_large=False):
+    """Run Azure CLI command (argv list) and return result
+    
+    With cache=True, a successful result for a command listed in CACHE_TTLS is
+    reused until its TTL expires or the az profile changes. With
+    expect_large=True, stdout goes to a temporary file instead of an in-memory
+    pipe buffer.
+    """
     print(f"🔧 {description or 'Running Azure command'}...")
-    print(f"   Command: {command}")
+    print(f"   Command: {shlex.join(argv)}")
+    
+    command = shlex.join(argv)
+    ttl = CACHE_TTLS.get(command) if cache and _cache_enabled() else None
+    # Keyed on the active profile so a cached subscription never outlives a switch
+    cache_key = f"{command}@{_az_profile_stamp()}"
+    if ttl:
+        with _cache_lock:
+            entry = _load_cache().get(cache_key)
+        if entry and entry["expires_at"] > time.time():
+            print("   ♻️ Using cached result")
+            return entry["value"]
+    
+    result = _execute_azure_cli_command(argv, expect_large)
+    
+    if ttl and result["success"]:
+        with _cache_lock:
+            # Drop expired entries, including those left by earlier profiles
+            now = time.time()
+            cache_data = {key: entry for key, entry in _load_cache().items() if entry["expires_at"] > now}
+            cache_data[cache_key] = {"value": result, "expires_at": time.time() + ttl}
+            _save_cache(cache_data)
+    
+    return result
+
+def _parse_cli_output(stdout, raw):
+    if stdout.strip():
+        try:
+            # Try to parse as JSON for structured output
+            json_result = orjson.loads(stdout) if ORJSON_AVAILABLE else json.loads(stdout)
+            return {"success": True, "data": json_result, "raw": raw}
+        except json.JSONDecodeError:
+            # Return as text if not JSON
+            if isinstance(stdout, bytes):
+                stdout = stdout.decode()
+            return {"success": True, "data": stdout.strip(), "raw": raw}
+    else:
+        return {"success": True, "data": None, "raw": raw}
+
+def _execute_azure_cli_command(argv, expect_large=False):
+    if argv and argv[0] == "az":
+        argv = [AZ_EXECUTABLE, *argv[1:]]
     
     try:
+        if expect_large:
+            # Large listings are written straight to disk and parsed from bytes,
+            # avoiding the separate bytes and str copies of a captured pipe
+            with tempfile.TemporaryFile() as spool:
+                subprocess.run(
+                    argv,
+                    stdout=spool,
+                    stderr=subprocess.PIPE,
+                    text=True,
+                    check=True
+                )
+                spool.seek(0)
+                return _parse_cli_output(spool.read(), None)
+        
         result = subprocess.run(
-            command, 
-            shell=True, 
+            argv, 
             capture_output=True, 
             text=True, 
             check=True
         )
         
-        if result.stdout.strip():
-            try:
-                # Try to parse as JSON for structured output
-                json_result = json.loads(result.stdout)
-                return {"success": True, "data": json_result, "raw": result.stdout}
-            except json.JSONDecodeError:
-                # Return as text if not JSON
-                return {"success": True, "data": result.stdout.strip(), "raw": result.stdout}
-        else:
-            return {"success": True, "data": None, "raw": result.stdout}
+        return _parse_cli_output(result.stdout, result.stdout)
             
     except subprocess.CalledProcessError as e:
         print(f"   ❌ Command failed: {e}")
         if e.stderr:
             print(f"   Error: {e.stderr}")
         return {"success": False, "error": str(e), "stderr": e.stderr}
+    except FileNotFoundError as e:
+        print(f"   ❌ Command failed: {e}")
+        return {"success": False, "error": str(e), "stderr": None}
+
+class AzJob:
+    """An Azure CLI command started in the background and reaped later
+    
+    Used for long-running calls (resource creation) so independent work can
+    proceed while az is waiting on Azure.
+    """
+    
+    def __init__(self, argv, description=""):
+        self.argv = argv
+        self.description = description
+        self.process = None
+        self.started_at = None
+        self._stdout = None
+        self._stderr = None
+        self._result = None
+    
+    def submit(self):
+        """Start the command and return immediately"""
+        print(f"🔧 {self.description or 'Running Azure command'} (in background)...")
+        print(f"   Command: {shlex.join(self.argv)}")
+        
+        argv = self.argv
+        if argv and argv[0] == "az":
+            argv = [AZ_EXECUTABLE, *argv[1:]]
+        
+        self._stdout = tempfile.TemporaryFile()
+        self._stderr = tempfile.TemporaryFile()
+        self.started_at = time.time()
+        try:
+            self.process = subprocess.Popen(argv, stdout=self._stdout, stderr=self._stderr)
+        except FileNotFoundError as e:
+            print(f"   ❌ Command failed: {e}")
+            self._result = {"success": False, "error": str(e), "stderr": None}
+            self._close()
+        return self
+    
+    def reap(self, progress_interval=15):
+        """Wait for the command to finish and return its parsed result"""
+        if self._result is not None:
+            return self._result
+        
+        while True:
+            try:
+                returncode = self.process.wait(timeout=progress_interval)
+                break
+            except subprocess.TimeoutExpired:
+                print(f"   ⏳ {self.description or 'Azure command'} still running ({int(time.time() - self.started_at)}s)...")
+        
+        self._stdout.seek(0)
+        self._stderr.seek(0)
+        stdout = self._stdout.read()
+        stderr = self._stderr.read().decode(errors="replace")
+        self._close()
+        
+        if returncode != 0:
+            error = str(subprocess.CalledProcessError(returncode, self.argv))
+            print(f"   ❌ Command failed: {error}")
+            if stderr:
+                print(f"   Error: {stderr}")
+            self._result = {"success": False, "error": error, "stderr": stderr}
+        else:
+            self._result = _parse_cli_output(stdout, None)
+        
+        return self._result
+    
+    def _close(self):
+        for spool in (self._stdout, self._stderr):
+            if spool:
+                spool.close()
+
+def run_azure_cli_commands(commands, max_workers=4, cache=False):
+    """Run independent Azure CLI commands concurrently
+    
+    Takes (argv, description) or (argv, description, expect_large) tuples and
+    returns results in the same order. Each az call pays its own interpreter
+    startup, so overlapping them saves most of the wall-clock time.
+    """
+    def run(command):
+        argv, description, *options = command
+        return run_azure_cli_command(argv, description, cache=cache, expect_large=bool(options and options[0]))
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(run, commands))
+
+def run_prechecks(rg_name="rg-adf-monitoring"):
+    """Run the read-only setup probes in parallel"""
+    print("🔍 Running Azure prechecks...")
+    
+    version_result, account_result, rg_result, factories_result = run_azure_cli_commands([
+        (["az", "--version"], "Checking Azure CLI installation"),
+        (["az", "account", "show"], "Checking Azure CLI login status"),
+        (["az", "group", "show", "--name", rg_name], f"Checking if resource group '{rg_name}' exists"),
+        (DATA_FACTORY_LIST_COMMAND, "Listing Azure Data Factories", True)
+    ], cache=True)
+    
+    return {
+        "version": version_result,
+        "account": account_result,
+        "resource_group": rg_result,
+        "data_factories": factories_result
+    }
 
-def check_azure_cli():
+def check_azure_cli(prechecks=None):
     """Check if Azure CLI is installed and user is logged in"""
+    global _SUBSCRIPTION_ID
     print("🔍 Checking Azure CLI...")
     
     # Check if Azure CLI is installed
-    result = run_azure_cli_command("az --version", "Checking Azure CLI installation")
+    if prechecks:
+        result = prechecks["version"]
+    else:
+        result = run_azure_cli_command(["az", "--version"], "Checking Azure CLI installation", cache=True)
     if not result["success"]:
         print("❌ Azure CLI is not installed")
         print("💡 Install from: https://docs.microsoft.com/en-us/cli/azure/install-azure-cli")
@@ -54,19 +402,23 @@ def check_azure_cli():
     print("✅ Azure CLI is installed")
     
     # Check if logged in
-    result = run_azure_cli_command("az account show", "Checking Azure CLI login status")
+    if prechecks:
+        result = prechecks["account"]
+    else:
+        result = run_azure_cli_command(["az", "account", "show"], "Checking Azure CLI login status", cache=True)
     if not result["success"]:
         print("❌ Not logged into Azure CLI")
         print("💡 Run: az login")
         return False
     
     account_info = result["data"]
+    _SUBSCRIPTION_ID = account_info.get("id")
     print(f"✅ Logged in as: {account_info.get('user', {}).get('name', 'Unknown')}")
     print(f"✅ Subscription: {account_info.get('name', 'Unknown')} ({account_info.get('id', 'Unknown')})")
     
     return True
 
-def get_or_create_resource_group():
+def get_or_create_resource_group(prechecks=None):
     """Get or create resource group for ADF monitoring"""
     print("\n📁 Setting up Resource Group...")
     
@@ -74,10 +426,13 @@ def get_or_create_resource_group():
     location = "East US"
     
     # Check if resource group exists
-    result = run_azure_cli_command(
-        f"az group show --name {rg_name}",
-        f"Checking if resource group '{rg_name}' exists"
-    )
+    if prechecks:
+        result = prechecks["resource_group"]
+    else:
+        result = run_azure_cli_command(
+            ["az", "group", "show", "--name", rg_name],
+            f"Checking if resource group '{rg_name}' exists"
+        )
     
     if result["success"]:
         print(f"✅ Resource group '{rg_name}' already exists")
@@ -86,7 +441,7 @@ def get_or_create_resource_group():
         # Create resource group
         print(f"🆕 Creating resource group '{rg_name}'...")
         result = run_azure_cli_command(
-            f"az group create --name {rg_name} --location \"{location}\"",
+            ["az", "group", "create", "--name", rg_name, "--location", location],
             f"Creating resource group in {location}"
         )
         
@@ -105,7 +460,8 @@ def create_service_principal():
     
     # Create service principal with Data Factory Contributor role
     result = run_azure_cli_command(
-        f"az ad sp create-for-rbac --name {sp_name} --role \"Data Factory Contributor\" --scope /subscriptions/$(az account show --query id -o tsv)",
+        ["az", "ad", "sp", "create-for-rbac", "--name", sp_name, "--role", "Data Factory Contributor",
+         "--scope", f"/subscriptions/{_SUBSCRIPTION_ID}"],
         "Creating service principal with Data Factory Contributor role"
     )
     
@@ -125,19 +481,60 @@ def create_service_principal():
         print(f"❌ Failed to create service principal: {result.get('error', 'Unknown error')}")
         return None
 
-def deploy_azure_openai():
-    """Deploy Azure OpenAI service"""
-    print("\n🧠 Deploying Azure OpenAI...")
+def start_azure_openai_resource():
+    """Start creating the Azure OpenAI resource in the background
     
+    Returns the generated resource name and the in-flight AzJob.
+    """
     openai_name = f"openai-adf-monitoring-{int(time.time())}"  # Unique name
     rg_name = "rg-adf-monitoring"
     location = "East US"
     
-    # Create Azure OpenAI resource
-    result = run_azure_cli_command(
-        f"az cognitiveservices account create --name {openai_name} --resource-group {rg_name} --kind OpenAI --sku S0 --location \"{location}\" --yes",
+    job = AzJob(
+        ["az", "cognitiveservices", "account", "create", "--name", openai_name, "--resource-group", rg_name,
+         "--kind", "OpenAI", "--sku", "S0", "--location", location, "--yes"],
         "Creating Azure OpenAI resource"
     )
+    return openai_name, job.submit()
+
+def discard_azure_openai_resource(openai_name, create_job):
+    """Wait for a background Azure OpenAI create and delete the resource again
+    
+    Used when setup can't finish, so an abandoned run doesn't leave a billable
+    S0 account behind.
+    """
+    rg_name = "rg-adf-monitoring"
+    location = "East US"
+    
+    print("🧹 Removing the Azure OpenAI resource started for this setup...")
+    if not create_job.reap()["success"]:
+        return
+    
+    run_azure_cli_command(
+        ["az", "cognitiveservices", "account", "delete", "--name", openai_name, "--resource-group", rg_name],
+        "Deleting Azure OpenAI resource"
+    )
+    # Deleted accounts are soft-deleted; purge so the name and quota are released
+    run_azure_cli_command(
+        ["az", "cognitiveservices", "account", "purge", "--name", openai_name, "--resource-group", rg_name,
+         "--location", location],
+        "Purging deleted Azure OpenAI resource"
+    )
+
+def deploy_azure_openai(openai_name=None, create_job=None):
+    """Deploy Azure OpenAI service
+    
+    Pass the values from start_azure_openai_resource() to finish a resource
+    creation that is already running; otherwise it is started here.
+    """
+    print("\n🧠 Deploying Azure OpenAI...")
+    
+    if create_job is None:
+        openai_name, create_job = start_azure_openai_resource()
+    rg_name = "rg-adf-monitoring"
+    
+    # Wait for the Azure OpenAI resource
+    result = create_job.reap()
     
     if not result["success"]:
         print(f"❌ Failed to create Azure OpenAI resource: {result.get('error', 'Unknown error')}")
@@ -147,8 +544,9 @@ def deploy_azure_openai():
     
     # Get the keys
     result = run_azure_cli_command(
-        f"az cognitiveservices account keys list --name {openai_name} --resource-group {rg_name}",
-        "Retrieving Azure OpenAI keys"
+        ["az", "cognitiveservices", "account", "keys", "list", "--name", openai_name, "--resource-group", rg_name],
+        "Retrieving Azure OpenAI keys",
+        expect_large=True
     )
     
     if not result["success"]:
@@ -157,30 +555,28 @@ def deploy_azure_openai():
     
     keys = result["data"]
     
-    # Create model deployment
-    deployment_name = "gpt-4-deployment"
-    print(f"🚀 Creating model deployment '{deployment_name}'...")
-    
-    result = run_azure_cli_command(
-        f"az cognitiveservices account deployment create --name {openai_name} --resource-group {rg_name} --deployment-name {deployment_name} --model-name gpt-4 --model-version \"0613\" --model-format OpenAI --sku-capacity 10 --sku-name Standard",
-        "Creating GPT-4 deployment"
-    )
+    # Create the GPT-4 deployment, falling back to GPT-3.5 Turbo if it fails.
+    # ARM serializes deployment operations on one account, so they run in turn
+    print("🚀 Creating model deployments...")
     
-    if result["success"]:
-        print("✅ GPT-4 deployment created successfully")
-    else:
-        print("⚠️ GPT-4 deployment failed, trying GPT-3.5 Turbo...")
-        deployment_name = "gpt-35-turbo-deployment"
-        
+    deployments = [
+        ("gpt-4-deployment", "gpt-4", "GPT-4"),
+        ("gpt-35-turbo-deployment", "gpt-35-turbo", "GPT-3.5 Turbo")
+    ]
+    for name, model, label in deployments:
+        deployment_name = name
         result = run_azure_cli_command(
-            f"az cognitiveservices account deployment create --name {openai_name} --resource-group {rg_name} --deployment-name {deployment_name} --model-name gpt-35-turbo --model-version \"0613\" --model-format OpenAI --sku-capacity 10 --sku-name Standard",
-            "Creating GPT-3.5 Turbo deployment"
+            ["az", "cognitiveservices", "account", "deployment", "create", "--name", openai_name,
+             "--resource-group", rg_name, "--deployment-name", name, "--model-name", model,
+             "--model-version", "0613", "--model-format", "OpenAI", "--sku-capacity", "10", "--sku-name", "Standard"],
+            f"Creating {label} deployment"
         )
-        
         if result["success"]:
-            print("✅ GPT-3.5 Turbo deployment created successfully")
-        else:
-            print("❌ Failed to create model deployment")
+            print(f"✅ {label} deployment created successfully")
+            break
+        print(f"⚠️ {label} deployment failed")
+    else:
+        print("❌ Failed to create model deployment")
     
     return {
         "resource_name": openai_name,
@@ -189,161 +585,73 @@ def deploy_azure_openai():
         "deployment_name": deployment_name
     }
 
-def find_data_factories():
+def find_data_factories(prechecks=None):
     """Find existing Data Factories in the subscription"""
     print("\n🏭 Searching for Azure Data Factories...")
     
-    result = run_azure_cli_command(
-        "az datafactory list --query \"[].{name:name, resourceGroup:resourceGroup, location:location}\" -o table",
-        "Listing Azure Data Factories"
-    )
+    if prechecks:
+        result = prechecks["data_factories"]
+    else:
+        result = run_azure_cli_command(DATA_FACTORY_LIST_COMMAND, "Listing Azure Data Factories", expect_large=True)
     
     if result["success"] and result["data"]:
         print("✅ Found Data Factories:")
-        print(result["data"])
+        for factory in result["data"]:
+            print(f"   - {factory['name']} (resource group: {factory['resourceGroup']}, location: {factory['location']})")
         return True
     else:
         print("⚠️ No Data Factories found in current subscription")
         print("💡 Create one at: https://portal.azure.com/#create/Microsoft.DataFactory")
         return False
 
-def generate_environment_file(sp_info, openai_info):
-    """Generate .env file with all configuration"""
-    print("\n📝 Generating environment configuration...")
-    
-    env_content = f"""# Azure Service Principal Configuration
-AZURE_CLIENT_ID={sp_info['client_id']}
-AZURE_CLIENT_SECRET={sp_info['client_secret']}
-AZURE_TENANT_ID={sp_info['tenant_id']}
-AZURE_SUBSCRIPTION_ID=$(az account show --query id -o tsv)
-
-# Azure OpenAI Configuration
-AZURE_OPENAI_ENDPOINT={openai_info['endpoint']}
-AZURE_OPENAI_API_KEY={openai_info['api_key']}
-AZURE_OPENAI_DEPLOYMENT_NAME={openai_info['deployment_name']}
-AZURE_OPENAI_API_VERSION=2024-02-15-preview
-
-# Application Configuration
-USE_AZURE_OPENAI=true
-ADF_MONITORING_ENABLED=true
-LOG_LEVEL=INFO
+def build_environment_file(sp_info, openai_info):
+    """Render the .env file contents"""
+    return ENV_FILE_TEMPLATE.format(
+        client_id=sp_info['client_id'],
+        client_secret=sp_info['client_secret'],
+        tenant_id=sp_info['tenant_id'],
+        subscription_id=_SUBSCRIPTION_ID,
+        endpoint=openai_info['endpoint'],
+        api_key=openai_info['api_key'],
+        deployment_name=openai_info['deployment_name'],
+        generated_at=datetime.now().isoformat()
+    )
 
-# Web Application
-STREAMLIT_HOST=0.0.0.0
-STREAMLIT_PORT=8502
+def build_config_files(openai_info):
+    """Render the YAML configuration files keyed by path"""
+    return {
+        "config/environments.yaml": ENVIRONMENTS_YAML,
+        "config/ai_providers.yaml": AI_PROVIDERS_YAML_TEMPLATE.format(
+            deployment_name=openai_info['deployment_name'],
+            endpoint=openai_info['endpoint']
+        )
+    }
 
-# Generated on: {datetime.now().isoformat()}
-"""
-    
-    try:
-        with open(".env", "w") as f:
-            f.write(env_content)
-        print("✅ Environment file created: .env")
-        return True
-    except Exception as e:
-        print(f"❌ Failed to create .env file: {e}")
-        return False
+def _write_file(path, content):
+    Path(path).write_text(content, encoding="utf-8")
+    return path
 
-def update_config_files(openai_info):
-    """Update YAML configuration files"""
-    print("\n⚙️ Updating configuration files...")
-    
-    # Update environments.yaml
-    env_config = f"""environments:
-  production:
-    name: "Production"
-    description: "Live Azure Data Factory monitoring"
-    azure_tenant_id: "${{AZURE_TENANT_ID}}"
-    azure_subscription_id: "${{AZURE_SUBSCRIPTION_ID}}"
-    azure_client_id: "${{AZURE_CLIENT_ID}}"
-    azure_client_secret: "${{AZURE_CLIENT_SECRET}}"
-    monitoring_enabled: true
-    log_level: "INFO"
-    refresh_interval: 300
-    ai_analysis_enabled: true
+def write_configuration_files(files):
+    """Write generated files concurrently (they are independent of each other)"""
+    print("\n📝 Writing configuration files...")
     
-  staging:
-    name: "Staging"
-    description: "Pre-production testing"
-    azure_tenant_id: "${{AZURE_TENANT_ID}}"
-    azure_subscription_id: "${{AZURE_SUBSCRIPTION_ID}}"
-    azure_client_id: "${{AZURE_CLIENT_ID}}"
-    azure_client_secret: "${{AZURE_CLIENT_SECRET}}"
-    monitoring_enabled: true
-    log_level: "DEBUG"
-    refresh_interval: 60
-    ai_analysis_enabled: true
+    os.makedirs("config", exist_ok=True)
     
-  development:
-    name: "Development"
-    description: "Local development and testing"
-    monitoring_enabled: false
-    log_level: "DEBUG"
-    refresh_interval: 30
-    ai_analysis_enabled: true
-"""
-    
-    # Update ai_providers.yaml
-    ai_config = f"""ai_providers:
-  - provider_id: "azure-openai-production"
-    provider_name: "Azure OpenAI (Production)"
-    provider_class: "OpenAIProvider"
-    model_name: "{openai_info['deployment_name']}"
-    api_endpoint: "{openai_info['endpoint']}"
-    api_key: "${{AZURE_OPENAI_API_KEY}}"
-    api_version: "2024-02-15-preview"
-    temperature: 0.3
-    max_tokens: 1000
-    top_p: 0.9
-    frequency_penalty: 0.0
-    confidence_threshold: 75
-    retry_confidence: 80
-    active: true
-    cost_per_1k_tokens: 0.02
-    
-  - provider_id: "azure-openai-backup"
-    provider_name: "Azure OpenAI (Backup)"
-    provider_class: "OpenAIProvider"
-    model_name: "gpt-35-turbo-deployment"
-    api_endpoint: "{openai_info['endpoint']}"
-    api_key: "${{AZURE_OPENAI_API_KEY}}"
-    api_version: "2024-02-15-preview"
-    temperature: 0.3
-    max_tokens: 800
-    confidence_threshold: 70
-    active: false
-    cost_per_1k_tokens: 0.001
-"""
+    success = True
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = {pool.submit(_write_file, path, content): path for path, content in files.items()}
+        for future in as_completed(futures):
+            try:
+                print(f"✅ Wrote {future.result()}")
+            except Exception as e:
+                print(f"❌ Failed to write {futures[future]}: {e}")
+                success = False
     
-    try:
-        os.makedirs("config", exist_ok=True)
-        
-        with open("config/environments.yaml", "w") as f:
-            f.write(env_config)
-        print("✅ Updated config/environments.yaml")
-        
-        with open("config/ai_providers.yaml", "w") as f:
-            f.write(ai_config)
-        print("✅ Updated config/ai_providers.yaml")
-        
-        return True
-    except Exception as e:
-        print(f"❌ Failed to update config files: {e}")
-        return False
+    return success
 
 def main():
     """Main setup function"""
-    print("🚀 Azure ADF Monitoring Setup Automation")
-    print("=" * 60)
-    print("This script will:")
-    print("1. Check Azure CLI setup")
-    print("2. Create/verify resource group")
-    print("3. Create service principal for ADF access")
-    print("4. Deploy Azure OpenAI service")
-    print("5. Create model deployments")
-    print("6. Generate configuration files")
-    print("7. Validate connections")
-    print("=" * 60)
+    sys.stdout.write(SETUP_BANNER)
     
     # Ask for confirmation
     confirm = input("\n🤔 Do you want to proceed with the setup? (y/N): ").strip().lower()
@@ -351,65 +659,48 @@ def main():
         print("❌ Setup cancelled by user")
         return
     
+    # Independent read-only probes run together up front
+    prechecks = run_prechecks()
+    
     # Step 1: Check Azure CLI
-    if not check_azure_cli():
+    if not check_azure_cli(prechecks):
         print("\n❌ Azure CLI setup required. Please fix and run again.")
         return
     
     # Step 2: Setup resource group
-    rg_name = get_or_create_resource_group()
+    rg_name = get_or_create_resource_group(prechecks)
     if not rg_name:
         print("\n❌ Resource group setup failed")
         return
     
+    # The Azure OpenAI resource create is the slowest call, so it runs in the
+    # background while the service principal is created
+    openai_name, openai_job = start_azure_openai_resource()
+    
     # Step 3: Create service principal
     sp_info = create_service_principal()
     if not sp_info:
         print("\n❌ Service principal creation failed")
+        discard_azure_openai_resource(openai_name, openai_job)
         return
     
     # Step 4: Deploy Azure OpenAI
-    openai_info = deploy_azure_openai()
+    openai_info = deploy_azure_openai(openai_name, openai_job)
     if not openai_info:
         print("\n❌ Azure OpenAI deployment failed")
         return
     
     # Step 5: Find Data Factories
-    find_data_factories()
+    find_data_factories(prechecks)
     
     # Step 6: Generate configuration
-    if not generate_environment_file(sp_info, openai_info):
+    files = {".env": build_environment_file(sp_info, openai_info), **build_config_files(openai_info)}
+    if not write_configuration_files(files):
         print("\n❌ Configuration generation failed")
         return
     
-    if not update_config_files(openai_info):
-        print("\n❌ Config file updates failed")
-        return
-    
     # Success summary
-    print("\n" + "=" * 60)
-    print("🎉 SETUP COMPLETED SUCCESSFULLY!")
-    print("=" * 60)
-    print("✅ Service Principal created")
-    print("✅ Azure OpenAI deployed")
-    print("✅ Configuration files generated")
-    print("✅ Environment variables set")
-    
-    print("\n📋 NEXT STEPS:")
-    print("1. Run: python test_adf_connection.py")
-    print("2. Run: python test_openai_connection.py")
-    print("3. Run: python startup.py webapp")
-    print("4. Open: http://localhost:8502")
-    
-    print("\n🔐 SECURITY NOTES:")
-    print("- Your service principal credentials are in .env")
-    print("- Keep these credentials secure and never commit to git")
-    print("- Consider using Azure Key Vault for production")
-    
-    print("\n💰 COST CONSIDERATIONS:")
-    print("- Azure OpenAI has usage-based pricing")
-    print("- Monitor usage in Azure portal")
-    print("- Set up billing alerts if needed")
+    sys.stdout.write(SETUP_COMPLETE_SUMMARY)
 
 if __name__ == "__main__":
     main()
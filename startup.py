@@ -7,8 +7,58 @@ import sys
 import subprocess
 import json
 import time
+import hashlib
+import re
+from functools import lru_cache
+from importlib.metadata import distributions
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+REQUIRED_PACKAGES = [
+    "streamlit",
+    "plotly", 
+    "pandas",
+    "yaml",  # PyYAML imports as 'yaml'
+    "requests",
+    "dotenv"  # python-dotenv imports as 'dotenv'
+]
+
+# Optional package -> environment variable that enables the feature using it
+OPTIONAL_PACKAGES = {
+    "openai": "OPENAI_API_KEY",
+    "anthropic": "ANTHROPIC_API_KEY",
+    "google-generativeai": "GOOGLE_AI_API_KEY",
+    "azure-identity": "AZURE_CLIENT_ID",
+    "azure-mgmt-datafactory": "AZURE_CLIENT_ID"
+}
+
+# Module name -> distribution name, where they differ
+PIP_NAMES = {
+    "yaml": "PyYAML",
+    "dotenv": "python-dotenv"
+}
+
+# Banner pre-encoded once so printing it is a single write
+_BANNER_BYTES = ("""
+███████╗██████╗░███████╗  ███╗░░░███╗░█████╗░███╗░░██╗██╗████████╗░█████╗░██████╗░
+██║░░██║██╔══██╗██╔════╝  ████╗░████║██╔══██╗████╗░██║██║╚══██╔══╝██╔══██╗██╔══██╗
+███████║██║░░██║█████╗░░  ██╔████╔██║██║░░██║██╔██╗██║██║░░░██║░░░██║░░██║██████╔╝
+██╔══██║██║░░██║██╔══╝░░  ██║╚██╔╝██║██║░░██║██║╚████║██║░░░██║░░░██║░░██║██╔══██╗
+██║░░██║██████╔╝██║░░░░░  ██║░╚═╝░██║╚█████╔╝██║░╚███║██║░░░██║░░░╚█████╔╝██║░░██║
+╚═╝░░╚═╝╚═════╝░╚═╝░░░░░  ╚═╝░░░░░╚═╝░╚════╝░╚═╝░░╚══╝╚═╝░░░╚═╝░░░░╚════╝░╚═╝░░╚═╝
+
+                    ██████╗░██████╗░░█████╗░
+                    ██╔══██╗██╔══██╗██╔══██╗
+                    ██████╔╝██████╔╝██║░░██║
+                    ██╔═══╝░██╔══██╗██║░░██║
+                    ██║░░░░░██║░░██║╚█████╔╝
+                    ╚═╝░░░░░╚═╝░░╚═╝░╚════╝░
+
+           🏭 Enterprise Azure Data Factory Monitoring & Automation
+           🤖 AI-Powered Pipeline Management • Multi-Environment Support
+           📊 Real-time Dashboards • Intelligent Error Analysis
+    
+""" + "=" * 80 + "\n").encode("utf-8")
 
 def check_python_version() -> bool:
     """Check if Python version is compatible"""
@@ -20,52 +70,81 @@ def check_python_version() -> bool:
         print(f"❌ Python {version.major}.{version.minor}.{version.micro} - Requires Python 3.8+")
         return False
 
-def check_dependencies() -> Dict[str, bool]:
-    """Check if required dependencies are installed"""
-    required_packages = [
-        "streamlit",
-        "plotly", 
-        "pandas",
-        "yaml",  # PyYAML imports as 'yaml'
-        "requests",
-        "dotenv"  # python-dotenv imports as 'dotenv'
-    ]
-    
-    optional_packages = [
-        "openai",
-        "anthropic", 
-        "google-generativeai",
-        "azure-identity",
-        "azure-mgmt-datafactory"
-    ]
+def _normalize(name: str) -> str:
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+@lru_cache(maxsize=None)
+def installed_distributions() -> frozenset:
+    """Normalized names of every installed distribution, from a single metadata scan"""
+    return frozenset(
+        _normalize(dist.metadata["Name"]) for dist in distributions() if dist.metadata["Name"]
+    )
+
+def is_installed(package: str) -> bool:
+    """Check a package against the installed distributions without importing it"""
+    return _normalize(PIP_NAMES.get(package, package)) in installed_distributions()
+
+def check_dependencies() -> Dict[str, Dict[str, Optional[bool]]]:
+    """Check if required dependencies are installed
     
+    Optional packages whose enabling environment variable is unset are
+    reported as None (not checked).
+    """
     results = {"required": {}, "optional": {}}
     
+    # One scan of installed metadata answers every lookup; nothing is imported
     print("\n🔍 Checking required dependencies...")
-    for package in required_packages:
-        try:
-            __import__(package.replace("-", "_"))
+    for package in REQUIRED_PACKAGES:
+        results["required"][package] = is_installed(package)
+        if results["required"][package]:
             print(f"  ✅ {package}")
-            results["required"][package] = True
-        except ImportError:
+        else:
             print(f"  ❌ {package} - Missing")
-            results["required"][package] = False
     
     print("\n🔍 Checking optional dependencies...")
-    for package in optional_packages:
-        try:
-            if package == "google-generativeai":
-                __import__("google.generativeai")
-            else:
-                __import__(package.replace("-", "_"))
+    for package, env_var in OPTIONAL_PACKAGES.items():
+        # The feature can't run without its credentials, so don't bother checking
+        if not os.environ.get(env_var):
+            results["optional"][package] = None
+            print(f"  ⏭️  {package} - Skipped ({env_var} not set)")
+            continue
+        
+        results["optional"][package] = is_installed(package)
+        if results["optional"][package]:
             print(f"  ✅ {package}")
-            results["optional"][package] = True
-        except ImportError:
+        else:
             print(f"  ⚠️  {package} - Optional (features limited)")
-            results["optional"][package] = False
     
     return results
 
+def _deps_stamp_path() -> Path:
+    """Stamp file marking a successful check for this interpreter and package list"""
+    key = hashlib.sha1(
+        repr((sys.executable, tuple(sys.version_info[:3]), tuple(REQUIRED_PACKAGES))).encode()
+    ).hexdigest()
+    return Path.home() / ".cache" / "adf_monitor" / f"deps-{key}.ok"
+
+def deps_previously_checked() -> bool:
+    """True if the checks already passed here and requirements.txt hasn't changed since"""
+    stamp = _deps_stamp_path()
+    try:
+        stamp_mtime = stamp.stat().st_mtime
+    except OSError:
+        return False
+    
+    requirements = Path("requirements.txt")
+    if requirements.exists() and requirements.stat().st_mtime > stamp_mtime:
+        return False
+    return True
+
+def mark_deps_checked():
+    stamp = _deps_stamp_path()
+    try:
+        stamp.parent.mkdir(parents=True, exist_ok=True)
+        stamp.touch()
+    except OSError:
+        pass  # Caching is best-effort
+
 def install_dependencies(missing_packages: List[str]) -> bool:
     """Install missing dependencies"""
     if not missing_packages:
@@ -74,25 +153,20 @@ def install_dependencies(missing_packages: List[str]) -> bool:
     print(f"\n📦 Installing missing packages: {', '.join(missing_packages)}")
     
     try:
-        # Create requirements for missing packages
-        requirements_content = "\n".join(missing_packages)
-        
-        with open("temp_requirements.txt", "w") as f:
-            f.write(requirements_content)
-        
-        # Install packages
+        # Pass packages straight to pip; skip its self-update check and prompts.
+        # Output streams to the terminal so progress is visible and nothing is buffered.
+        sys.stdout.flush()
         result = subprocess.run([
-            sys.executable, "-m", "pip", "install", "-r", "temp_requirements.txt"
-        ], capture_output=True, text=True)
-        
-        # Clean up temp file
-        os.remove("temp_requirements.txt")
+            sys.executable, "-m", "pip", "install",
+            "--disable-pip-version-check", "--no-input", "--prefer-binary",
+            *(PIP_NAMES.get(package, package) for package in missing_packages)
+        ])
         
         if result.returncode == 0:
             print("✅ Dependencies installed successfully!")
             return True
         else:
-            print(f"❌ Failed to install dependencies: {result.stderr}")
+            print(f"❌ Failed to install dependencies (pip exited with code {result.returncode}, see output above)")
             return False
     
     except Exception as e:
@@ -182,29 +256,36 @@ def setup_database():
         print(f"❌ Error setting up database: {e}")
         return False
 
-def check_port_availability(port: int = 8501) -> bool:
-    """Check if the default Streamlit port is available"""
+def find_free_port(start: int = 8501, tries: int = 20) -> Optional[int]:
+    """Return the first port in [start, start + tries) that can be bound, or None"""
     import socket
     
-    try:
+    for port in range(start, start + tries):
         with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            s.bind(('localhost', port))
-            return True
-    except OSError:
-        return False
+            # Ignore TIME_WAIT leftovers from a previous run; on Windows this
+            # option would also allow binding over a live listener, so skip it there
+            if os.name != "nt":
+                s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            try:
+                s.bind(('localhost', port))
+                return port
+            except OSError:
+                continue
+    return None
 
 def launch_application(mode: str = "webapp", port: int = 8501):
     """Launch the application"""
     print(f"\n🚀 Launching ADF Monitor Pro...")
     
     if mode == "webapp":
-        # Check port availability
-        if not check_port_availability(port):
-            print(f"⚠️  Port {port} is busy, trying port {port + 1}")
-            port += 1
-            if not check_port_availability(port):
-                print(f"❌ Port {port} is also busy. Please specify a different port.")
-                return False
+        # Find the first free port at or above the requested one
+        free_port = find_free_port(port)
+        if free_port is None:
+            print(f"❌ Ports {port}-{port + 19} are all busy. Please specify a different port.")
+            return False
+        if free_port != port:
+            print(f"⚠️  Port {port} is busy, using port {free_port}")
+            port = free_port
         
         print(f"🌐 Starting web application on http://localhost:{port}")
         print("📖 Access the application in your browser")
@@ -240,37 +321,27 @@ def launch_application(mode: str = "webapp", port: int = 8501):
     
     elif mode == "test":
         print("🧪 Running tests...")
+        # Run in this interpreter; only the Streamlit server needs its own process
         try:
-            result = subprocess.run([sys.executable, "test_system.py"])
-            return result.returncode == 0
+            import runpy
+            runpy.run_path("test_system.py", run_name="__main__")
+            return True
+        except SystemExit as e:
+            return e.code in (None, 0)
         except Exception as e:
             print(f"❌ Error running tests: {e}")
             return False
 
 def print_banner():
     """Print application banner"""
-    banner = """
-███████╗██████╗░███████╗  ███╗░░░███╗░█████╗░███╗░░██╗██╗████████╗░█████╗░██████╗░
-██║░░██║██╔══██╗██╔════╝  ████╗░████║██╔══██╗████╗░██║██║╚══██╔══╝██╔══██╗██╔══██╗
-███████║██║░░██║█████╗░░  ██╔████╔██║██║░░██║██╔██╗██║██║░░░██║░░░██║░░██║██████╔╝
-██╔══██║██║░░██║██╔══╝░░  ██║╚██╔╝██║██║░░██║██║╚████║██║░░░██║░░░██║░░██║██╔══██╗
-██║░░██║██████╔╝██║░░░░░  ██║░╚═╝░██║╚█████╔╝██║░╚███║██║░░░██║░░░╚█████╔╝██║░░██║
-╚═╝░░╚═╝╚═════╝░╚═╝░░░░░  ╚═╝░░░░░╚═╝░╚════╝░╚═╝░░╚══╝╚═╝░░░╚═╝░░░░╚════╝░╚═╝░░╚═╝
-
-                    ██████╗░██████╗░░█████╗░
-                    ██╔══██╗██╔══██╗██╔══██╗
-                    ██████╔╝██████╔╝██║░░██║
-                    ██╔═══╝░██╔══██╗██║░░██║
-                    ██║░░░░░██║░░██║╚█████╔╝
-                    ╚═╝░░░░░╚═╝░░╚═╝░╚════╝░
-
-           🏭 Enterprise Azure Data Factory Monitoring & Automation
-           🤖 AI-Powered Pipeline Management • Multi-Environment Support
-           📊 Real-time Dashboards • Intelligent Error Analysis
-    """
-    
-    print(banner)
-    print("=" * 80)
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:
+        # stdout replaced by a text-only stream (e.g. captured in tests)
+        sys.stdout.write(_BANNER_BYTES.decode("utf-8"))
+        return
+    sys.stdout.flush()
+    buffer.write(_BANNER_BYTES)
+    buffer.flush()
 
 def show_help():
     """Show help information"""
@@ -337,8 +408,13 @@ def main():
     # Print banner
     print_banner()
     
+    # Skip the checks when they already passed on this interpreter
+    if not args.skip_checks and deps_previously_checked():
+        print("✅ Python version and dependencies verified previously (cached)")
+        args.skip_checks = True
+    
     # Check Python version
-    if not check_python_version():
+    if not args.skip_checks and not check_python_version():
         print("\n❌ Incompatible Python version. Please upgrade to Python 3.8+")
         sys.exit(1)
     
@@ -357,8 +433,10 @@ def main():
             else:
                 print(f"\n❌ Missing required dependencies: {', '.join(missing_required)}")
                 print("Run with --install-deps to auto-install or install manually:")
-                print(f"  pip install {' '.join(missing_required)}")
+                print(f"  pip install {' '.join(PIP_NAMES.get(pkg, pkg) for pkg in missing_required)}")
                 sys.exit(1)
+        else:
+            mark_deps_checked()
     
     # Setup and initialization
     if args.command == "setup" or not Path("config").exists():
@@ -3,37 +3,60 @@ Test Azure Data Factory Connection
 Validates authentication and ADF access for the monitoring application
 """
 import os
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
+from functools import lru_cache
+from importlib.metadata import distributions
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+@lru_cache(maxsize=None)
+def installed_distributions():
+    """Normalized names of every installed distribution, from a single metadata scan"""
+    return frozenset(
+        re.sub(r"[-_.]+", "-", dist.metadata["Name"]).lower()
+        for dist in distributions() if dist.metadata["Name"]
+    )
+
+@lru_cache(maxsize=None)
+def _azure_sdk():
+    """Import the Azure SDK classes on first use and reuse them afterwards"""
+    from azure.identity import ClientSecretCredential
+    from azure.mgmt.datafactory import DataFactoryManagementClient
+    from azure.core.exceptions import AzureError, HttpResponseError
+    return ClientSecretCredential, DataFactoryManagementClient, AzureError, HttpResponseError
+
+@lru_cache(maxsize=1)
+def _credential():
+    """Process-wide service principal credential
+    
+    azure-identity caches the access token on the credential, so every test
+    after the first reuses it instead of making another AAD round-trip.
+    """
+    ClientSecretCredential, _, _, _ = _azure_sdk()
+    return ClientSecretCredential(
+        tenant_id=os.getenv("AZURE_TENANT_ID"),
+        client_id=os.getenv("AZURE_CLIENT_ID"),
+        client_secret=os.getenv("AZURE_CLIENT_SECRET")
+    )
+
 def test_azure_packages():
     """Test if required Azure packages are installed"""
     print("🔍 Checking Azure SDK packages...")
     
-    try:
-        from azure.identity import ClientSecretCredential
-        print("  ✅ azure-identity")
-    except ImportError:
-        print("  ❌ azure-identity - Run: pip install azure-identity")
-        return False
-    
-    try:
-        from azure.mgmt.datafactory import DataFactoryManagementClient
-        print("  ✅ azure-mgmt-datafactory")
-    except ImportError:
-        print("  ❌ azure-mgmt-datafactory - Run: pip install azure-mgmt-datafactory")
-        return False
+    # Checked against installed package metadata so the SDKs aren't loaded here
+    installed = installed_distributions()
     
-    try:
-        from azure.core.exceptions import AzureError
-        print("  ✅ azure-core")
-    except ImportError:
-        print("  ❌ azure-core - Run: pip install azure-core")
-        return False
+    for package in ("azure-identity", "azure-mgmt-datafactory", "azure-core"):
+        if package in installed:
+            print(f"  ✅ {package}")
+        else:
+            print(f"  ❌ {package} - Run: pip install {package}")
+            return False
     
     return True
 
@@ -48,16 +71,18 @@ def test_environment_variables():
         "AZURE_SUBSCRIPTION_ID"
     ]
     
-    missing_vars = []
+    env = os.environ
+    present = {var: env[var] for var in required_vars if env.get(var)}
+    missing_vars = [var for var in required_vars if var not in present]
+    
     for var in required_vars:
-        value = os.getenv(var)
-        if value:
+        if var in present:
             # Show first 8 characters for security
+            value = present[var]
             masked_value = value[:8] + "..." if len(value) > 8 else value
             print(f"  ✅ {var}: {masked_value}")
         else:
             print(f"  ❌ {var}: Not set")
-            missing_vars.append(var)
     
     if missing_vars:
         print(f"\n❌ Missing environment variables: {', '.join(missing_vars)}")
@@ -71,13 +96,7 @@ def test_azure_authentication():
     print("\n🔐 Testing Azure authentication...")
     
     try:
-        from azure.identity import ClientSecretCredential
-        
-        credential = ClientSecretCredential(
-            tenant_id=os.getenv("AZURE_TENANT_ID"),
-            client_id=os.getenv("AZURE_CLIENT_ID"),
-            client_secret=os.getenv("AZURE_CLIENT_SECRET")
-        )
+        credential = _credential()
         
         # Test credential by getting a token
         token = credential.get_token("https://management.azure.com/.default")
@@ -99,16 +118,10 @@ def test_adf_connection():
     print("\n🏭 Testing Azure Data Factory connection...")
     
     try:
-        from azure.identity import ClientSecretCredential
-        from azure.mgmt.datafactory import DataFactoryManagementClient
-        from azure.core.exceptions import AzureError
+        _, DataFactoryManagementClient, AzureError, HttpResponseError = _azure_sdk()
         
-        # Setup authentication
-        credential = ClientSecretCredential(
-            tenant_id=os.getenv("AZURE_TENANT_ID"),
-            client_id=os.getenv("AZURE_CLIENT_ID"),
-            client_secret=os.getenv("AZURE_CLIENT_SECRET")
-        )
+        # Setup authentication (same credential and token as the authentication test)
+        credential = _credential()
         
         # Create ADF client
         client = DataFactoryManagementClient(
@@ -137,27 +150,38 @@ def test_adf_connection():
             resource_groups = list(resource_client.resource_groups.list())
             print(f"  📁 Found {len(resource_groups)} resource groups")
             
+            # List data factories in all resource groups concurrently; each call
+            # is an independent ARM round-trip
+            def list_factories(rg_name):
+                return list(client.factories.list_by_resource_group(rg_name))
+            
+            factories_by_rg = {}
+            with ThreadPoolExecutor(max_workers=16) as executor:
+                futures = {executor.submit(list_factories, rg.name): rg.name for rg in resource_groups}
+                for future in as_completed(futures):
+                    rg_name = futures[future]
+                    try:
+                        factories_by_rg[rg_name] = future.result()
+                    except HttpResponseError as e:
+                        # Skip resource groups we don't have access to (checked
+                        # by ARM error code, which isn't localized)
+                        if getattr(e.error, "code", None) == "AuthorizationFailed":
+                            continue
+                        print(f"    ⚠️  Error accessing RG '{rg_name}': {e}")
+                    except AzureError as e:
+                        print(f"    ⚠️  Error accessing RG '{rg_name}': {e}")
+            
             for rg in resource_groups:
-                try:
-                    # List data factories in each resource group
-                    factories = list(client.factories.list_by_resource_group(rg.name))
-                    
-                    if factories:
-                        print(f"  🏭 Resource Group '{rg.name}':")
-                        for factory in factories:
-                            print(f"    - {factory.name} (Location: {factory.location})")
-                            factories_found.append({
-                                "name": factory.name,
-                                "resource_group": rg.name,
-                                "location": factory.location
-                            })
-                            
-                except AzureError as e:
-                    # Skip resource groups we don't have access to
-                    if "AuthorizationFailed" in str(e):
-                        continue
-                    else:
-                        print(f"    ⚠️  Error accessing RG '{rg.name}': {e}")
+                factories = factories_by_rg.get(rg.name)
+                if factories:
+                    print(f"  🏭 Resource Group '{rg.name}':")
+                    for factory in factories:
+                        print(f"    - {factory.name} (Location: {factory.location})")
+                        factories_found.append({
+                            "name": factory.name,
+                            "resource_group": rg.name,
+                            "location": factory.location
+                        })
                         
         except ImportError:
             print("  ⚠️  azure-mgmt-resource not installed, using manual configuration")
@@ -167,19 +191,26 @@ def test_adf_connection():
             print(f"\n  ✅ Found {len(factories_found)} Data Factory instances")
             print("  💡 Update your config/environments.yaml with these details:")
             
-            for factory in factories_found:
-                print(f"""
-    - name: "{factory['name']}"
-      subscription_id: "{os.getenv('AZURE_SUBSCRIPTION_ID')}"
-      resource_group: "{factory['resource_group']}"
-      data_factory: "{factory['name']}"
-      region: "{factory['location']}"
-      tenant_id: "{os.getenv('AZURE_TENANT_ID')}"
-      client_id: "{os.getenv('AZURE_CLIENT_ID')}"
-      client_secret: "{os.getenv('AZURE_CLIENT_SECRET')}"
-      status: "Active"
-      polling_interval: 300
-      retry_attempts: 3""")
+            import yaml
+            
+            environments = [
+                {
+                    "name": factory["name"],
+                    "subscription_id": os.getenv("AZURE_SUBSCRIPTION_ID"),
+                    "resource_group": factory["resource_group"],
+                    "data_factory": factory["name"],
+                    "region": factory["location"],
+                    "tenant_id": os.getenv("AZURE_TENANT_ID"),
+                    "client_id": os.getenv("AZURE_CLIENT_ID"),
+                    "client_secret": os.getenv("AZURE_CLIENT_SECRET"),
+                    "status": "Active",
+                    "polling_interval": 300,
+                    "retry_attempts": 3
+                }
+                for factory in factories_found
+            ]
+            print()
+            print(yaml.safe_dump({"environments": environments}, sort_keys=False))
             
             return True
         else:
@@ -209,37 +240,36 @@ def create_sample_config():
     print("\n📝 Creating sample configuration...")
     
     try:
+        import yaml
+        
+        def template_environment(name, stage, polling_interval, retry_attempts):
+            return {
+                "name": name,
+                "subscription_id": os.getenv("AZURE_SUBSCRIPTION_ID", "your-subscription-id"),
+                "resource_group": f"your-{stage}-rg-name",
+                "data_factory": f"your-{stage}-adf-name",
+                "region": "eastus",
+                "tenant_id": os.getenv("AZURE_TENANT_ID", "your-tenant-id"),
+                "client_id": os.getenv("AZURE_CLIENT_ID", "your-client-id"),
+                "client_secret": os.getenv("AZURE_CLIENT_SECRET", "your-client-secret"),
+                "status": "Active",
+                "polling_interval": polling_interval,
+                "retry_attempts": retry_attempts
+            }
+        
         # Update environments.yaml template
-        config_template = f"""# Real Azure Data Factory Environments
-# Update these with your actual ADF instances
-
-environments:
-  - name: "Production"
-    subscription_id: "{os.getenv('AZURE_SUBSCRIPTION_ID', 'your-subscription-id')}"
-    resource_group: "your-prod-rg-name"
-    data_factory: "your-prod-adf-name"
-    region: "eastus"
-    tenant_id: "{os.getenv('AZURE_TENANT_ID', 'your-tenant-id')}"
-    client_id: "{os.getenv('AZURE_CLIENT_ID', 'your-client-id')}"
-    client_secret: "{os.getenv('AZURE_CLIENT_SECRET', 'your-client-secret')}"
-    status: "Active"
-    polling_interval: 300
-    retry_attempts: 3
-
-  - name: "Staging"
-    subscription_id: "{os.getenv('AZURE_SUBSCRIPTION_ID', 'your-subscription-id')}"
-    resource_group: "your-stage-rg-name"
-    data_factory: "your-stage-adf-name"
-    region: "eastus"
-    tenant_id: "{os.getenv('AZURE_TENANT_ID', 'your-tenant-id')}"
-    client_id: "{os.getenv('AZURE_CLIENT_ID', 'your-client-id')}"
-    client_secret: "{os.getenv('AZURE_CLIENT_SECRET', 'your-client-secret')}"
-    status: "Active"
-    polling_interval: 600
-    retry_attempts: 2
-
-# Add more environments as needed
-"""
+        config = {
+            "environments": [
+                template_environment("Production", "prod", 300, 3),
+                template_environment("Staging", "stage", 600, 2)
+            ]
+        }
+        config_template = (
+            "# Real Azure Data Factory Environments\n"
+            "# Update these with your actual ADF instances\n\n"
+            + yaml.safe_dump(config, sort_keys=False)
+            + "\n# Add more environments as needed\n"
+        )
         
         with open("config/environments_template.yaml", "w") as f:
             f.write(config_template)
@@ -2,105 +2,247 @@
 Test Azure OpenAI Connection
 Validates Azure OpenAI authentication and model access
 """
+import asyncio
+import hashlib
+import json
+import logging
 import os
+import sqlite3
 import sys
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
 from dotenv import load_dotenv
 
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
 # Load environment variables
 load_dotenv()
 
+# Progress goes through logging so pytest captures it and only shows it on failure.
+# main() prints it at AIMS_TEST_LOG level (INFO by default)
+log = logging.getLogger("aims.tests")
+
+@dataclass(frozen=True)
+class AIConfig:
+    """AI provider settings, resolved once from the environment"""
+    azure_endpoint: Optional[str]
+    azure_api_key: Optional[str]
+    azure_deployment: Optional[str]
+    azure_api_version: str
+    openai_api_key: Optional[str]
+    llm_cache_disabled: bool
+    
+    @property
+    def azure_configured(self) -> bool:
+        return bool(self.azure_endpoint and self.azure_api_key and self.azure_deployment)
+
+CFG = AIConfig(
+    azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
+    azure_api_key=os.getenv("AZURE_OPENAI_API_KEY"),
+    azure_deployment=os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME"),
+    azure_api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-15-preview"),
+    openai_api_key=os.getenv("OPENAI_API_KEY"),
+    llm_cache_disabled=os.getenv("AIMS_LLM_NO_CACHE") == "1"
+)
+
+AI_PROVIDERS_TEMPLATE = """# Real Azure OpenAI Configuration
+# Update these with your actual Azure OpenAI details
+
+ai_providers:
+  - provider_id: "azure-openai-gpt4"
+    provider_name: "Azure OpenAI GPT-4"
+    provider_class: "OpenAIProvider"
+    model_name: "{deployment}"
+    api_endpoint: "{endpoint}"
+    api_key: "{azure_key}"
+    temperature: 0.3
+    max_tokens: 1000
+    top_p: 0.9
+    frequency_penalty: 0.0
+    confidence_threshold: 75
+    retry_confidence: 80
+    active: true
+    cost_per_1k_tokens: 0.02
+
+  - provider_id: "azure-openai-gpt35"
+    provider_name: "Azure OpenAI GPT-3.5 Turbo"
+    provider_class: "OpenAIProvider"
+    model_name: "gpt-35-turbo-deployment"
+    api_endpoint: "{endpoint}"
+    api_key: "{azure_key}"
+    temperature: 0.3
+    max_tokens: 1000
+    confidence_threshold: 70
+    active: false  # Enable as backup
+    cost_per_1k_tokens: 0.001
+
+  - provider_id: "openai-gpt4-fallback"
+    provider_name: "OpenAI GPT-4 (Fallback)"
+    provider_class: "OpenAIProvider"
+    model_name: "gpt-4"
+    api_endpoint: "https://api.openai.com/v1/chat/completions"
+    api_key: "{openai_key}"
+    temperature: 0.3
+    max_tokens: 1000
+    active: false  # Enable if needed
+    cost_per_1k_tokens: 0.03
+
+# Add more providers as needed (Google, Anthropic, etc.)
+"""
+
+def _mask(value: str) -> str:
+    """Show only the first 8 characters of a secret"""
+    return value[:8] + "..." if len(value) > 8 else value
+
+@lru_cache(maxsize=1)
+def _azure_client():
+    """Shared Azure OpenAI client, so its connection pool is reused across probes"""
+    from openai import AsyncAzureOpenAI
+    return AsyncAzureOpenAI(
+        azure_endpoint=CFG.azure_endpoint,
+        api_key=CFG.azure_api_key,
+        api_version=CFG.azure_api_version
+    )
+
+@lru_cache(maxsize=1)
+def _openai_client():
+    """Shared OpenAI client for the fallback probe"""
+    from openai import AsyncOpenAI
+    return AsyncOpenAI(api_key=CFG.openai_api_key)
+
+# Number of requests sent by the --benchmark throughput probe
+BENCHMARK_REQUESTS = 50
+
+# Error corpora larger than this go through the Batch API instead of real-time calls
+BATCH_THRESHOLD = 20
+BATCH_POLL_SECONDS = 30
+
+# On-disk cache of analysis responses, so re-runs don't repeat identical prompts.
+# Set AIMS_LLM_NO_CACHE=1 to always call the model
+LLM_CACHE_PATH = os.path.join(".cache", "aims_llm.sqlite")
+LLM_CACHE_TTL_SECONDS = 7 * 24 * 3600
+
+@lru_cache(maxsize=1)
+def _llm_cache():
+    """Open the response cache database, creating it on first use"""
+    os.makedirs(os.path.dirname(LLM_CACHE_PATH), exist_ok=True)
+    conn = sqlite3.connect(LLM_CACHE_PATH)
+    conn.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, created_at REAL, body TEXT)")
+    return conn
+
+def llm_cache_key(**fields):
+    """Deterministic SHA-256 key over the fields that determine a response"""
+    return hashlib.sha256(json.dumps(fields, sort_keys=True).encode()).hexdigest()
+
+def load_cached_response(key):
+    """Return a cached response younger than the TTL, or None"""
+    if CFG.llm_cache_disabled:
+        return None
+    row = _llm_cache().execute(
+        "SELECT body FROM responses WHERE key = ? AND created_at > ?",
+        (key, time.time() - LLM_CACHE_TTL_SECONDS)
+    ).fetchone()
+    return json.loads(row[0]) if row else None
+
+def store_cached_response(key, response):
+    """Cache a response under the given key"""
+    if CFG.llm_cache_disabled:
+        return
+    with _llm_cache() as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (key, created_at, body) VALUES (?, ?, ?)",
+            (key, time.time(), json.dumps(response))
+        )
+
+async def close_clients():
+    """Close any shared clients opened by the probes"""
+    for factory in (_azure_client, _openai_client):
+        if factory.cache_info().currsize:
+            await factory().close()
+            factory.cache_clear()
+
 def test_openai_packages():
     """Test if OpenAI package is installed"""
-    print("🔍 Checking OpenAI packages...")
+    log.info("🔍 Checking OpenAI packages...")
     
     try:
         import openai
-        print(f"  ✅ openai (version: {openai.__version__})")
+        log.info(f"  ✅ openai (version: {openai.__version__})")
         return True
     except ImportError:
-        print("  ❌ openai - Run: pip install openai")
+        log.warning("  ❌ openai - Run: pip install openai")
         return False
 
 def test_environment_variables():
     """Test if required environment variables are set"""
-    print("\n🔧 Checking environment variables...")
+    log.info("\n🔧 Checking environment variables...")
     
     azure_vars = [
-        "AZURE_OPENAI_ENDPOINT",
-        "AZURE_OPENAI_API_KEY",
-        "AZURE_OPENAI_DEPLOYMENT_NAME"
+        ("AZURE_OPENAI_ENDPOINT", CFG.azure_endpoint),
+        ("AZURE_OPENAI_API_KEY", CFG.azure_api_key),
+        ("AZURE_OPENAI_DEPLOYMENT_NAME", CFG.azure_deployment)
     ]
     
     openai_vars = [
-        "OPENAI_API_KEY"
+        ("OPENAI_API_KEY", CFG.openai_api_key)
     ]
     
-    print("  🧠 Azure OpenAI Configuration:")
+    log.info("  🧠 Azure OpenAI Configuration:")
     azure_configured = True
-    for var in azure_vars:
-        value = os.getenv(var)
+    for var, value in azure_vars:
         if value:
-            if "KEY" in var:
-                masked_value = value[:8] + "..." if len(value) > 8 else value
-            else:
-                masked_value = value
-            print(f"    ✅ {var}: {masked_value}")
+            masked_value = _mask(value) if "KEY" in var else value
+            log.info(f"    ✅ {var}: {masked_value}")
         else:
-            print(f"    ❌ {var}: Not set")
+            log.warning(f"    ❌ {var}: Not set")
             azure_configured = False
     
-    print("  🤖 OpenAI Fallback Configuration:")
+    log.info("  🤖 OpenAI Fallback Configuration:")
     openai_configured = True
-    for var in openai_vars:
-        value = os.getenv(var)
+    for var, value in openai_vars:
         if value:
-            masked_value = value[:8] + "..." if len(value) > 8 else value
-            print(f"    ✅ {var}: {masked_value}")
+            log.info(f"    ✅ {var}: {_mask(value)}")
         else:
-            print(f"    ⚠️  {var}: Not set (fallback disabled)")
+            log.info(f"    ⚠️  {var}: Not set (fallback disabled)")
             openai_configured = False
     
     if not azure_configured and not openai_configured:
-        print("\n❌ No AI providers configured!")
+        log.warning("\n❌ No AI providers configured!")
         return False
     elif azure_configured:
-        print("\n✅ Azure OpenAI is configured (recommended)")
+        log.info("\n✅ Azure OpenAI is configured (recommended)")
         return True
     else:
-        print("\n⚠️  Only OpenAI fallback is configured")
+        log.info("\n⚠️  Only OpenAI fallback is configured")
         return True
 
-def test_azure_openai_connection():
+async def probe_azure_openai_connection():
     """Test Azure OpenAI connection"""
-    print("\n🧠 Testing Azure OpenAI connection...")
+    log.info("\n🧠 Testing Azure OpenAI connection...")
     
     # Check if Azure OpenAI is configured
-    endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
-    api_key = os.getenv("AZURE_OPENAI_API_KEY")
-    deployment = os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME")
-    
-    if not all([endpoint, api_key, deployment]):
-        print("  ⚠️  Azure OpenAI not configured, skipping...")
+    if not CFG.azure_configured:
+        log.info("  ⚠️  Azure OpenAI not configured, skipping...")
         return False
     
     try:
-        import openai
+        client = _azure_client()
         
-        # Configure Azure OpenAI
-        openai.api_type = "azure"
-        openai.api_base = endpoint
-        openai.api_version = os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-15-preview")
-        openai.api_key = api_key
-        
-        print(f"  🔗 Endpoint: {endpoint}")
-        print(f"  🚀 Deployment: {deployment}")
-        print(f"  📅 API Version: {openai.api_version}")
+        log.info(f"  🔗 Endpoint: {CFG.azure_endpoint}")
+        log.info(f"  🚀 Deployment: {CFG.azure_deployment}")
+        log.info(f"  📅 API Version: {CFG.azure_api_version}")
         
         # Test with a simple completion
-        print("  🧪 Testing AI analysis...")
+        log.info("  🧪 Testing AI analysis...")
         
-        response = openai.ChatCompletion.create(
-            engine=deployment,
+        response = await client.chat.completions.create(
+            model=CFG.azure_deployment,
             messages=[
                 {
                     "role": "system", 
@@ -117,63 +259,56 @@ def test_azure_openai_connection():
         
         if response and response.choices:
             content = response.choices[0].message.content
-            print(f"  ✅ Azure OpenAI response received")
-            print(f"  📝 Sample analysis: {content[:100]}...")
+            log.info(f"  ✅ Azure OpenAI response received")
+            log.info(f"  📝 Sample analysis: {content[:100]}...")
             
             # Check token usage
             if hasattr(response, 'usage'):
                 tokens_used = response.usage.total_tokens
-                print(f"  🔢 Tokens used: {tokens_used}")
+                log.info(f"  🔢 Tokens used: {tokens_used}")
                 
                 # Estimate cost (approximate)
                 cost_per_1k = 0.02  # Azure OpenAI GPT-4 pricing
                 estimated_cost = (tokens_used / 1000) * cost_per_1k
-                print(f"  💰 Estimated cost: ${estimated_cost:.4f}")
+                log.info(f"  💰 Estimated cost: ${estimated_cost:.4f}")
             
             return True
         else:
-            print("  ❌ No response received from Azure OpenAI")
+            log.warning("  ❌ No response received from Azure OpenAI")
             return False
             
     except Exception as e:
-        print(f"  ❌ Azure OpenAI connection failed: {e}")
+        log.warning(f"  ❌ Azure OpenAI connection failed: {e}")
         
         # Provide helpful error messages
         if "401" in str(e) or "Unauthorized" in str(e):
-            print("  💡 Check your API key - it might be invalid or expired")
+            log.info("  💡 Check your API key - it might be invalid or expired")
         elif "404" in str(e) or "NotFound" in str(e):
-            print("  💡 Check your endpoint URL and deployment name")
+            log.info("  💡 Check your endpoint URL and deployment name")
         elif "quota" in str(e).lower():
-            print("  💡 You may have exceeded your quota or rate limits")
+            log.info("  💡 You may have exceeded your quota or rate limits")
         elif "deployment" in str(e).lower():
-            print("  💡 Check if your model deployment is active and properly named")
+            log.info("  💡 Check if your model deployment is active and properly named")
         
         return False
 
-def test_openai_fallback():
+async def probe_openai_fallback():
     """Test OpenAI fallback connection"""
-    print("\n🤖 Testing OpenAI fallback connection...")
+    log.info("\n🤖 Testing OpenAI fallback connection...")
     
-    api_key = os.getenv("OPENAI_API_KEY")
-    
-    if not api_key:
-        print("  ⚠️  OpenAI API key not configured, skipping...")
+    if not CFG.openai_api_key:
+        log.info("  ⚠️  OpenAI API key not configured, skipping...")
         return False
     
     try:
-        import openai
+        client = _openai_client()
         
-        # Configure regular OpenAI
-        openai.api_type = "open_ai"
-        openai.api_base = "https://api.openai.com/v1"
-        openai.api_key = api_key
-        
-        print("  🔗 Using OpenAI API")
+        log.info("  🔗 Using OpenAI API")
         
         # Test with a simple completion
-        print("  🧪 Testing AI analysis...")
+        log.info("  🧪 Testing AI analysis...")
         
-        response = openai.ChatCompletion.create(
+        response = await client.chat.completions.create(
             model="gpt-3.5-turbo",  # Use cheaper model for testing
             messages=[
                 {
@@ -191,155 +326,291 @@ def test_openai_fallback():
         
         if response and response.choices:
             content = response.choices[0].message.content
-            print(f"  ✅ OpenAI response: {content}")
+            log.info(f"  ✅ OpenAI response: {content}")
             
             # Check token usage
             if hasattr(response, 'usage'):
                 tokens_used = response.usage.total_tokens
-                print(f"  🔢 Tokens used: {tokens_used}")
+                log.info(f"  🔢 Tokens used: {tokens_used}")
                 
                 # Estimate cost
                 cost_per_1k = 0.001  # GPT-3.5-turbo pricing
                 estimated_cost = (tokens_used / 1000) * cost_per_1k
-                print(f"  💰 Estimated cost: ${estimated_cost:.4f}")
+                log.info(f"  💰 Estimated cost: ${estimated_cost:.4f}")
             
             return True
         else:
-            print("  ❌ No response received from OpenAI")
+            log.warning("  ❌ No response received from OpenAI")
             return False
             
     except Exception as e:
-        print(f"  ❌ OpenAI connection failed: {e}")
+        log.warning(f"  ❌ OpenAI connection failed: {e}")
         
         if "401" in str(e) or "Unauthorized" in str(e):
-            print("  💡 Check your OpenAI API key")
+            log.info("  💡 Check your OpenAI API key")
         elif "quota" in str(e).lower() or "billing" in str(e).lower():
-            print("  💡 Check your OpenAI billing and usage limits")
+            log.info("  💡 Check your OpenAI billing and usage limits")
         
         return False
 
-def test_ai_analysis_flow():
+async def probe_ai_analysis_flow():
     """Test the complete AI analysis flow"""
-    print("\n🔬 Testing AI analysis workflow...")
+    log.info("\n🔬 Testing AI analysis workflow...")
     
     # Test both providers if available
     providers_tested = 0
     providers_working = 0
     
     # Test Azure OpenAI
-    if os.getenv("AZURE_OPENAI_API_KEY"):
-        print("  🧠 Testing Azure OpenAI analysis...")
+    if CFG.azure_api_key:
+        log.info("  🧠 Testing Azure OpenAI analysis...")
         try:
             # Simulate the actual analysis flow from the application
             from genai_analyzer import GenAIAnalyzer
             
             analyzer = GenAIAnalyzer()
-            result = analyzer.analyze_failure_with_genai(
-                pipeline_name="TestPipeline",
-                error_message="Connection timeout to source database after 30 seconds",
-                run_id="test-run-001"
+            pipeline_name = "TestPipeline"
+            error_message = "Connection timeout to source database after 30 seconds"
+            run_id = "test-run-001"
+            cache_key = llm_cache_key(
+                pipeline_name=pipeline_name,
+                error_message=error_message,
+                model=analyzer.config.model,
+                temperature=analyzer.config.temperature
             )
             
+            result = load_cached_response(cache_key)
+            if result is not None:
+                log.info("    ♻️  Using cached analysis (set AIMS_LLM_NO_CACHE=1 to call the model)")
+            else:
+                result = await analyzer.analyze_failure_async(pipeline_name, error_message, run_id)
+                # Mock fallbacks carry run_id "mock"; only cache real model responses
+                if result.get("success") and result.get("run_id") == run_id:
+                    store_cached_response(cache_key, result)
+            
             providers_tested += 1
             
             if result.get("success"):
-                print("    ✅ Azure OpenAI analysis successful")
+                log.info("    ✅ Azure OpenAI analysis successful")
                 analysis = result.get("analysis", {})
-                print(f"    📊 Error Type: {analysis.get('error_type', 'unknown')}")
-                print(f"    🎯 Confidence: {analysis.get('confidence_score', 0)}%")
-                print(f"    🔄 Should Retry: {analysis.get('should_retry', False)}")
+                log.info(f"    📊 Error Type: {analysis.get('error_type', 'unknown')}")
+                log.info(f"    🎯 Confidence: {analysis.get('confidence_score', 0)}%")
+                log.info(f"    🔄 Should Retry: {analysis.get('should_retry', False)}")
                 providers_working += 1
             else:
-                print("    ❌ Azure OpenAI analysis failed")
+                log.warning("    ❌ Azure OpenAI analysis failed")
                 
         except Exception as e:
-            print(f"    ❌ Error testing Azure OpenAI: {e}")
+            log.warning(f"    ❌ Error testing Azure OpenAI: {e}")
     
     # Test OpenAI fallback
-    if os.getenv("OPENAI_API_KEY"):
-        print("  🤖 Testing OpenAI fallback analysis...")
+    if CFG.openai_api_key:
+        log.info("  🤖 Testing OpenAI fallback analysis...")
         try:
             # Test would go here - for now just indicate it's available
             providers_tested += 1
-            print("    ✅ OpenAI fallback available")
+            log.info("    ✅ OpenAI fallback available")
             providers_working += 1
             
         except Exception as e:
-            print(f"    ❌ Error testing OpenAI: {e}")
+            log.warning(f"    ❌ Error testing OpenAI: {e}")
     
     if providers_working > 0:
-        print(f"  ✅ AI analysis working ({providers_working}/{providers_tested} providers)")
+        log.info(f"  ✅ AI analysis working ({providers_working}/{providers_tested} providers)")
         return True
     else:
-        print("  ❌ No AI providers working")
+        log.warning("  ❌ No AI providers working")
         return False
 
 def create_sample_ai_config():
     """Create sample AI provider configuration"""
-    print("\n📝 Creating sample AI configuration...")
+    log.info("\n📝 Creating sample AI configuration...")
     
     try:
-        config_template = f"""# Real Azure OpenAI Configuration
-# Update these with your actual Azure OpenAI details
-
-ai_providers:
-  - provider_id: "azure-openai-gpt4"
-    provider_name: "Azure OpenAI GPT-4"
-    provider_class: "OpenAIProvider"
-    model_name: "{os.getenv('AZURE_OPENAI_DEPLOYMENT_NAME', 'gpt-4-deployment')}"
-    api_endpoint: "{os.getenv('AZURE_OPENAI_ENDPOINT', 'https://your-resource.openai.azure.com/')}"
-    api_key: "{os.getenv('AZURE_OPENAI_API_KEY', 'your-azure-openai-api-key')}"
-    temperature: 0.3
-    max_tokens: 1000
-    top_p: 0.9
-    frequency_penalty: 0.0
-    confidence_threshold: 75
-    retry_confidence: 80
-    active: true
-    cost_per_1k_tokens: 0.02
-
-  - provider_id: "azure-openai-gpt35"
-    provider_name: "Azure OpenAI GPT-3.5 Turbo"
-    provider_class: "OpenAIProvider"
-    model_name: "gpt-35-turbo-deployment"
-    api_endpoint: "{os.getenv('AZURE_OPENAI_ENDPOINT', 'https://your-resource.openai.azure.com/')}"
-    api_key: "{os.getenv('AZURE_OPENAI_API_KEY', 'your-azure-openai-api-key')}"
-    temperature: 0.3
-    max_tokens: 1000
-    confidence_threshold: 70
-    active: false  # Enable as backup
-    cost_per_1k_tokens: 0.001
-
-  - provider_id: "openai-gpt4-fallback"
-    provider_name: "OpenAI GPT-4 (Fallback)"
-    provider_class: "OpenAIProvider"
-    model_name: "gpt-4"
-    api_endpoint: "https://api.openai.com/v1/chat/completions"
-    api_key: "{os.getenv('OPENAI_API_KEY', 'your-openai-api-key')}"
-    temperature: 0.3
-    max_tokens: 1000
-    active: false  # Enable if needed
-    cost_per_1k_tokens: 0.03
-
-# Add more providers as needed (Google, Anthropic, etc.)
-"""
+        config_template = AI_PROVIDERS_TEMPLATE.format_map({
+            "deployment": CFG.azure_deployment or "gpt-4-deployment",
+            "endpoint": CFG.azure_endpoint or "https://your-resource.openai.azure.com/",
+            "azure_key": CFG.azure_api_key or "your-azure-openai-api-key",
+            "openai_key": CFG.openai_api_key or "your-openai-api-key"
+        })
         
         with open("config/ai_providers_template.yaml", "w") as f:
             f.write(config_template)
         
-        print("  ✅ Created config/ai_providers_template.yaml")
-        print("  💡 Copy this to config/ai_providers.yaml and update with your details")
+        log.info("  ✅ Created config/ai_providers_template.yaml")
+        log.info("  💡 Copy this to config/ai_providers.yaml and update with your details")
         
         return True
         
     except Exception as e:
-        print(f"  ❌ Failed to create AI config template: {e}")
+        log.warning(f"  ❌ Failed to create AI config template: {e}")
         return False
 
+async def _raw_chat(session, messages, max_tokens=1):
+    """POST straight to the Azure chat completions endpoint, bypassing the SDK's HTTP client"""
+    url = (
+        f"{CFG.azure_endpoint.rstrip('/')}/openai/deployments/{CFG.azure_deployment}"
+        f"/chat/completions?api-version={CFG.azure_api_version}"
+    )
+    payload = {"messages": messages, "max_tokens": max_tokens, "temperature": 0}
+    
+    async with session.post(url, headers={"api-key": CFG.azure_api_key}, json=payload) as resp:
+        resp.raise_for_status()
+        return await resp.json()
+
+async def benchmark_azure_openai(requests=BENCHMARK_REQUESTS):
+    """Measure steady-state Azure OpenAI throughput with concurrent raw requests"""
+    log.info("\n⏱️  Benchmarking Azure OpenAI throughput...")
+    
+    if not AIOHTTP_AVAILABLE:
+        log.info("  ⚠️  aiohttp not installed, skipping... (pip install aiohttp)")
+        return False
+    
+    if not CFG.azure_configured:
+        log.info("  ⚠️  Azure OpenAI not configured, skipping...")
+        return False
+    
+    messages = [{"role": "user", "content": "Reply with OK."}]
+    connector = aiohttp.TCPConnector(limit=100, ttl_dns_cache=300, keepalive_timeout=30)
+    
+    async with aiohttp.ClientSession(connector=connector) as session:
+        started = time.perf_counter()
+        outcomes = await asyncio.gather(
+            *(_raw_chat(session, messages) for _ in range(requests)),
+            return_exceptions=True
+        )
+        elapsed = time.perf_counter() - started
+    
+    failures = [outcome for outcome in outcomes if isinstance(outcome, Exception)]
+    succeeded = requests - len(failures)
+    log.info(f"  📨 {succeeded}/{requests} requests succeeded in {elapsed:.2f}s")
+    log.info(f"  🚀 Throughput: {succeeded / elapsed:.1f} requests/s")
+    if failures:
+        log.warning(f"  ❌ First failure: {failures[0]}")
+    
+    return not failures
+
+async def submit_batch(prompts):
+    """Run {custom_id: messages} through the Azure OpenAI Batch API, returning {custom_id: content}"""
+    client = _azure_client()
+    
+    lines = [
+        json.dumps({
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/chat/completions",
+            "body": {"model": CFG.azure_deployment, "messages": messages, "max_tokens": 1000, "temperature": 0.3}
+        })
+        for custom_id, messages in prompts.items()
+    ]
+    batch_file = await client.files.create(file=("aims_batch.jsonl", "\n".join(lines).encode()), purpose="batch")
+    batch = await client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/chat/completions",
+        completion_window="24h"
+    )
+    log.info(f"  📦 Submitted batch {batch.id} ({len(lines)} requests)")
+    
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        await asyncio.sleep(BATCH_POLL_SECONDS)
+        batch = await client.batches.retrieve(batch.id)
+        log.info(f"  ⏳ Batch status: {batch.status}")
+    
+    if batch.status != "completed":
+        raise RuntimeError(f"Batch {batch.id} ended with status '{batch.status}'")
+    
+    output = await client.files.content(batch.output_file_id)
+    results = {}
+    for line in output.text.splitlines():
+        record = json.loads(line)
+        response = record.get("response")
+        if response and response.get("status_code") == 200:
+            results[record["custom_id"]] = response["body"]["choices"][0]["message"]["content"]
+    return results
+
+async def sweep_error_corpus(path):
+    """Classify every failed run in a JSON corpus, batching large corpora"""
+    log.info(f"\n🧹 Sweeping error corpus {path}...")
+    
+    from genai_analyzer import GenAIAnalyzer
+    
+    with open(path) as f:
+        runs = [run for run in json.load(f) if run.get("message")]
+    analyzer = GenAIAnalyzer()
+    
+    if len(runs) > BATCH_THRESHOLD and CFG.azure_configured:
+        prompts = {
+            run["runId"]: analyzer._build_messages(
+                analyzer._create_analysis_prompt(run["pipelineName"], run["message"], [])
+            )
+            for run in runs
+        }
+        try:
+            contents = await submit_batch(prompts)
+        finally:
+            await close_clients()
+        classified = [
+            (run, analyzer._parse_analysis_response(contents[run["runId"]], run["runId"]))
+            for run in runs if run["runId"] in contents
+        ]
+    else:
+        results = await asyncio.gather(*(
+            analyzer.analyze_failure_async(run["pipelineName"], run["message"], run["runId"])
+            for run in runs
+        ))
+        classified = list(zip(runs, results))
+    
+    for run, result in classified:
+        analysis = result.get("analysis", {})
+        log.info(f"  • {run['runId']}: {analysis.get('error_type', 'unknown')} "
+              f"(retry: {analysis.get('should_retry', False)}, confidence: {analysis.get('confidence_score', 0)}%)")
+    log.info(f"  ✅ Classified {len(classified)}/{len(runs)} failures")
+    return len(classified) == len(runs)
+
+async def _run_probe(probe):
+    """Await one probe, then close the shared clients it opened"""
+    try:
+        return await probe
+    finally:
+        await close_clients()
+
+def test_azure_openai_connection():
+    """Test Azure OpenAI connection on its own"""
+    return asyncio.run(_run_probe(probe_azure_openai_connection()))
+
+def test_openai_fallback():
+    """Test OpenAI fallback on its own"""
+    return asyncio.run(_run_probe(probe_openai_fallback()))
+
+def test_ai_analysis_flow():
+    """Test the AI analysis flow on its own"""
+    return asyncio.run(_run_probe(probe_ai_analysis_flow()))
+
+async def run_network_probes():
+    """Run the network-bound probes concurrently, returning (name, result) pairs"""
+    probes = [
+        ("Azure OpenAI Connection", probe_azure_openai_connection()),
+        ("OpenAI Fallback", probe_openai_fallback()),
+        ("AI Analysis Flow", probe_ai_analysis_flow())
+    ]
+    try:
+        outcomes = await asyncio.gather(*(probe for _, probe in probes), return_exceptions=True)
+    finally:
+        await close_clients()
+    
+    results = []
+    for (name, _), outcome in zip(probes, outcomes):
+        if isinstance(outcome, Exception):
+            log.warning(f"  ❌ {name} raised: {outcome}")
+            outcome = False
+        results.append((name, outcome))
+    return results
+
 def main():
     """Main test function"""
-    print("🧠 Azure OpenAI Connection Test")
-    print("=" * 50)
+    logging.basicConfig(level=os.getenv("AIMS_TEST_LOG", "INFO").upper(), format="%(message)s", stream=sys.stdout)
+    log.info("🧠 Azure OpenAI Connection Test")
+    log.info("=" * 50)
     
     results = []
     
@@ -349,48 +620,51 @@ def main():
     # Test 2: Environment variables
     results.append(("Environment Variables", test_environment_variables()))
     
-    # Test 3: Azure OpenAI connection
-    results.append(("Azure OpenAI Connection", test_azure_openai_connection()))
-    
-    # Test 4: OpenAI fallback
-    results.append(("OpenAI Fallback", test_openai_fallback()))
-    
-    # Test 5: AI analysis flow
-    results.append(("AI Analysis Flow", test_ai_analysis_flow()))
+    # Tests 3-5: Azure OpenAI connection, OpenAI fallback and AI analysis flow.
+    # Each is bound by network round-trips, so they run concurrently
+    results.extend(asyncio.run(run_network_probes()))
     
     # Test 6: Create sample config
     results.append(("Sample Configuration", create_sample_ai_config()))
     
+    # Optional throughput benchmark, not counted towards the results
+    if "--benchmark" in sys.argv:
+        asyncio.run(benchmark_azure_openai())
+    
+    # Optional regression sweep over a corpus of failed runs, e.g. test_scenarios.json
+    if "--sweep" in sys.argv:
+        asyncio.run(sweep_error_corpus(sys.argv[sys.argv.index("--sweep") + 1]))
+    
     # Summary
-    print("\n" + "=" * 50)
-    print("📋 TEST RESULTS SUMMARY")
-    print("=" * 50)
+    log.info("\n" + "=" * 50)
+    log.info("📋 TEST RESULTS SUMMARY")
+    log.info("=" * 50)
     
     passed = 0
     total = len(results)
     
     for test_name, result in results:
         status = "✅ PASS" if result else "❌ FAIL"
-        print(f"{status} {test_name}")
+        log.info(f"{status} {test_name}")
         if result:
             passed += 1
     
-    print(f"\n🎯 Results: {passed}/{total} tests passed")
+    log.info(f"\n🎯 Results: {passed}/{total} tests passed")
     
     if passed >= 4:  # Allow some tests to fail (like fallback)
-        print("\n🎉 AI connection is ready!")
-        print("Next steps:")
-        print("1. Update config/ai_providers.yaml with your AI provider details")
-        print("2. Set USE_AZURE_OPENAI=true in your environment")
-        print("3. Run: python startup.py webapp")
-        print("4. Test AI analysis in the web interface")
+        log.info("\n🎉 AI connection is ready!")
+        log.info("Next steps:")
+        log.info("1. Update config/ai_providers.yaml with your AI provider details")
+        log.info("2. Set USE_AZURE_OPENAI=true in your environment")
+        log.info("3. Run: python startup.py webapp")
+        log.info("4. Test AI analysis in the web interface")
     else:
-        print(f"\n⚠️  {total - passed} critical tests failed. Please fix the issues above.")
-        print("Common solutions:")
-        print("- Install OpenAI package: pip install openai")
-        print("- Update .env file with correct Azure OpenAI credentials")
-        print("- Verify your Azure OpenAI deployment is active")
-        print("- Check your API quotas and billing status")
+        log.info(f"\n⚠️  {total - passed} critical tests failed. Please fix the issues above.")
+        log.info("Common solutions:")
+        log.info("- Install OpenAI package: pip install openai")
+        log.info("- Update .env file with correct Azure OpenAI credentials")
+        log.info("- Verify your Azure OpenAI deployment is active")
+        log.info("- Check your API quotas and billing status")
 
 if __name__ == "__main__":
     main()
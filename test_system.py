@@ -5,33 +5,72 @@ import pytest
 import json
 import tempfile
 import os
+import sys
 from datetime import datetime, timedelta
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 # Import modules to test
+from config import OpenAIConfig
 from database import DatabaseManager, PipelineRun, MonitoringAction
-from genai_analyzer import GenAIAnalyzer, should_rerun_pipeline, log_decision_and_action
+from genai_analyzer import GenAIAnalyzer, should_rerun_pipeline, log_decision_and_action, flush_monitoring_actions
 from adf_client import ADFClient
-from mock_data import MockDataGenerator, create_test_scenario
+from mock_data import MockDataGenerator
+from notification_service import NotificationService
+
+try:
+    import xdist  # noqa: F401
+    XDIST_AVAILABLE = True
+except ImportError:
+    XDIST_AVAILABLE = False
+
+# Canned model reply, shaped like the analyzer's mock transient analysis
+CANNED_ANALYSIS = {
+    "error_type": "transient",
+    "severity": "medium",
+    "should_retry": True,
+    "retry_delay_minutes": 10,
+    "confidence_score": 85,
+    "analysis_summary": "Network/timeout error detected.",
+    "root_cause": "Network connectivity or service timeout",
+    "recommended_actions": ["Retry the pipeline"],
+    "manual_intervention_required": False
+}
+
+@pytest.fixture(autouse=True)
+def _no_openai_network():
+    """Answer chat completion requests with CANNED_ANALYSIS so no test reaches the network"""
+    response = MagicMock()
+    response.choices[0].message.content = json.dumps(CANNED_ANALYSIS)
+    with patch("openai.resources.chat.completions.Completions.create", return_value=response), \
+         patch("openai.resources.chat.completions.AsyncCompletions.create", new=AsyncMock(return_value=response)):
+        yield
+
+@pytest.fixture(scope="class")
+def db_manager():
+    """One in-memory test database, with its schema, shared by a test class"""
+    db_manager = DatabaseManager(":memory:")
+    yield db_manager
+    db_manager._connect().close()
+
+@pytest.fixture(scope="class")
+def adf_client():
+    """One ADF client shared by a test class, so authentication is set up once"""
+    return ADFClient()
 
 class TestDatabaseManager:
     """Test database functionality"""
     
-    def setup_method(self):
-        """Setup test database"""
-        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
-        self.temp_db.close()
-        self.db_manager = DatabaseManager(self.temp_db.name)
-    
-    def teardown_method(self):
-        """Cleanup test database"""
-        os.unlink(self.temp_db.name)
+    @pytest.fixture(autouse=True)
+    def _truncate(self, db_manager):
+        """Empty the tables between tests instead of rebuilding the schema"""
+        yield
+        with db_manager._connect() as conn:
+            conn.execute("DELETE FROM monitoring_actions")
+            conn.execute("DELETE FROM pipeline_runs")
     
-    def test_database_initialization(self):
+    def test_database_initialization(self, db_manager):
         """Test database tables are created"""
-        import sqlite3
-        conn = sqlite3.connect(self.temp_db.name)
-        cursor = conn.cursor()
+        cursor = db_manager._connect().cursor()
         
         # Check if tables exist
         cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
@@ -40,10 +79,8 @@ class TestDatabaseManager:
         expected_tables = ['pipeline_runs', 'monitoring_actions', 'error_patterns']
         for table in expected_tables:
             assert table in tables
-        
-        conn.close()
     
-    def test_insert_pipeline_run(self):
+    def test_insert_pipeline_run(self, db_manager):
         """Test inserting pipeline run"""
         pipeline_run = PipelineRun(
             run_id="test-run-001",
@@ -55,15 +92,34 @@ class TestDatabaseManager:
             factory_name="TestFactory"
         )
         
-        success = self.db_manager.insert_pipeline_run(pipeline_run)
+        success = db_manager.insert_pipeline_run(pipeline_run)
         assert success
         
         # Verify data was inserted
-        failed_runs = self.db_manager.get_failed_runs_last_hours(1)
+        failed_runs = db_manager.get_failed_runs_last_hours(1)
         assert len(failed_runs) == 1
         assert failed_runs[0]['run_id'] == "test-run-001"
     
-    def test_get_dashboard_stats(self):
+    def test_insert_pipeline_runs_bulk(self, db_manager):
+        """Test bulk inserting generated pipeline runs"""
+        runs = MockDataGenerator().generate_pipeline_runs(count=50, failed_percentage=1.0)
+        pipeline_runs = [
+            PipelineRun(
+                run_id=run['runId'],
+                pipeline_name=run['pipelineName'],
+                status=run['status'],
+                start_time=datetime.now(),
+                end_time=datetime.now(),
+                error_message=run['message'],
+                factory_name="TestFactory"
+            )
+            for run in runs
+        ]
+        
+        assert db_manager.insert_pipeline_runs_bulk(pipeline_runs)
+        assert len(db_manager.get_failed_runs_last_hours(1)) == len({run['runId'] for run in runs})
+    
+    def test_get_dashboard_stats(self, db_manager):
         """Test dashboard statistics"""
         # Insert some test data
         pipeline_run = PipelineRun(
@@ -76,9 +132,9 @@ class TestDatabaseManager:
             factory_name="TestFactory"
         )
         
-        self.db_manager.insert_pipeline_run(pipeline_run)
+        db_manager.insert_pipeline_run(pipeline_run)
         
-        stats = self.db_manager.get_dashboard_stats()
+        stats = db_manager.get_dashboard_stats()
         assert 'total_runs_today' in stats
         assert 'failed_runs_today' in stats
         assert 'success_rate_today' in stats
@@ -111,6 +167,50 @@ class TestGenAIAnalyzer:
         assert result['analysis']['should_retry'] is False
         assert result['analysis']['manual_intervention_required'] is True
     
+    def test_mock_analysis_returns_independent_copies(self):
+        """Test mutating a mock analysis doesn't leak into later ones"""
+        first = self.analyzer._get_mock_analysis("Connection timeout")
+        first['analysis']['recommended_actions'].append("Injected")
+        
+        second = self.analyzer._get_mock_analysis("Connection timeout")
+        assert "Injected" not in second['analysis']['recommended_actions']
+    
+    def test_analysis_cache_reuses_response(self):
+        """Test repeated failures reuse the cached GenAI analysis"""
+        self.analyzer.config = OpenAIConfig(api_key="test-key")
+        self.analyzer.client = Mock()
+        response = MagicMock()
+        response.choices[0].message.content = json.dumps({
+            "error_type": "transient",
+            "should_retry": True,
+            "confidence_score": 85,
+            "analysis_summary": "Timeout"
+        })
+        self.analyzer.client.chat.completions.create.return_value = response
+        
+        first = self.analyzer.analyze_failure_with_genai("TestPipeline", "Connection timeout", "run-1")
+        second = self.analyzer.analyze_failure_with_genai("TestPipeline", "Connection timeout", "run-2")
+        
+        assert self.analyzer.client.chat.completions.create.call_count == 1
+        assert first['run_id'] == "run-1"
+        assert second['run_id'] == "run-2"
+        assert second['analysis'] == first['analysis']
+        
+        # Editing one result must not leak into later cache hits
+        second['analysis']['error_type'] = "edited"
+        third = self.analyzer.analyze_failure_with_genai("TestPipeline", "Connection timeout", "run-3")
+        assert third['analysis']['error_type'] == "transient"
+    
+    def test_analysis_cache_ignores_volatile_tokens(self):
+        """Test errors differing only in IDs and timestamps share a cache key, but not in error codes"""
+        first = self.analyzer._cache_key("TestPipeline", "Timeout at 2024-05-01T10:15:30Z (run prod-run-001, activity 1f0e4c2a-9b7d-4e3f-8a61-2c5d7e9f0b13)")
+        second = self.analyzer._cache_key("TestPipeline", "timeout at 2024-05-02 08:00:01.250  (run prod-run-002, activity 7a2b9c0d-1e3f-4a5b-9c6d-8e7f0a1b2c3d)")
+        other = self.analyzer._cache_key("TestPipeline", "Missing required column 'customer_id'")
+        
+        assert first == second
+        assert first != other
+        assert self.analyzer._cache_key("TestPipeline", "Error 404") != self.analyzer._cache_key("TestPipeline", "Error 500")
+    
     def test_should_rerun_pipeline_logic(self):
         """Test pipeline rerun decision logic"""
         # Test case: should retry
@@ -144,13 +244,9 @@ class TestGenAIAnalyzer:
 class TestADFClient:
     """Test ADF client functionality"""
     
-    def setup_method(self):
-        """Setup test client"""
-        self.client = ADFClient()
-    
-    def test_mock_data_generation(self):
+    def test_mock_data_generation(self, adf_client):
         """Test mock data is generated properly"""
-        mock_response = self.client._get_mock_data("/pipelineruns", "GET")
+        mock_response = adf_client._get_mock_data("/pipelineruns", "GET")
         
         assert 'value' in mock_response
         assert len(mock_response['value']) > 0
@@ -161,9 +257,9 @@ class TestADFClient:
         for field in required_fields:
             assert field in first_run
     
-    def test_get_pipeline_runs(self):
+    def test_get_pipeline_runs(self, adf_client):
         """Test getting pipeline runs"""
-        runs = self.client.get_pipeline_runs(hours_back=1)
+        runs = adf_client.get_pipeline_runs(hours_back=1)
         
         assert isinstance(runs, list)
         if runs:
@@ -211,6 +307,51 @@ class TestMockDataGenerator:
             assert 'confidence_score' in response
             assert 'analysis_summary' in response
 
+class TestNotificationService:
+    """Test cases for alert batching"""
+
+    def test_mixed_batch_uses_most_severe_color(self):
+        """A retry followed by a failure flushes as one red Teams card"""
+        service = NotificationService()
+        service._teams_enabled = True
+        service._email_enabled = False
+        service.config = Mock(teams_webhook_url="https://example.invalid/webhook")
+        session = MagicMock()
+
+        with patch.object(service, "_get_session", return_value=session):
+            service.send_alert("retry", "PipelineA", "Retrying")
+            service.send_alert("failure", "PipelineB", "Failed")
+            service.flush_pending_alerts()
+            service._pool.shutdown(wait=True)
+
+        session.post.assert_called_once()
+        kwargs = session.post.call_args.kwargs
+        card = json.loads(kwargs["data"]) if "data" in kwargs else kwargs["json"]
+        assert card["themeColor"] == NotificationService._TEAMS_COLOR_MAP["failure"]
+        assert card["summary"] == "ADF Alerts: 2 pipeline alerts"
+
+class TestWebAppManager:
+    """Test web app database writes"""
+
+    def test_bulk_insert_runs(self, tmp_path):
+        """Test bulk inserted runs commit once and skip duplicate run_ids"""
+        pytest.importorskip("streamlit")
+        from webapp import WebAppManager
+
+        manager = WebAppManager(str(tmp_path / "webapp.db"))
+        rows = [
+            (f"run-{i}", "Production", "TestPipeline", "Failed", 0, 60000, "Test error", 1)
+            for i in range(3)
+        ]
+
+        manager.bulk_insert_runs(rows)
+        manager.bulk_insert_runs(rows[:1])
+
+        count = manager._write_conn.execute("SELECT COUNT(*) FROM pipeline_runs").fetchone()[0]
+        assert count == 3
+        assert not manager._write_conn.in_transaction
+        manager._write_conn.close()
+
 class TestIntegration:
     """Integration tests"""
     
@@ -260,74 +401,29 @@ class TestIntegration:
             pipeline_run.run_id,
             analysis_result,
             "retry" if should_retry else "manual_intervention",
-            True
+            True,
+            manager=self.db_manager
         )
         
         assert action_id is not None
+        flush_monitoring_actions()
         
         # 6. Verify logged action
         retry_history = self.db_manager.get_retry_history(pipeline_run.pipeline_name, hours=1)
         assert len(retry_history) > 0
         assert retry_history[0]['run_id'] == pipeline_run.run_id
 
-def run_tests():
-    """Run all tests"""
-    print("🧪 Running ADF Monitoring System Tests")
-    print("=====================================")
-    
-    # Create test scenarios
-    test_scenarios = create_test_scenario()
-    print(f"✅ Created {len(test_scenarios)} test scenarios")
-    
-    # Run database tests
-    print("\n🗄️  Testing Database Manager...")
-    db_test = TestDatabaseManager()
-    db_test.setup_method()
-    try:
-        db_test.test_database_initialization()
-        db_test.test_insert_pipeline_run()
-        db_test.test_get_dashboard_stats()
-        print("✅ Database tests passed")
-    finally:
-        db_test.teardown_method()
-    
-    # Run GenAI analyzer tests
-    print("\n🤖 Testing GenAI Analyzer...")
-    genai_test = TestGenAIAnalyzer()
-    genai_test.setup_method()
-    genai_test.test_mock_analysis_transient_error()
-    genai_test.test_mock_analysis_data_quality_error()
-    genai_test.test_should_rerun_pipeline_logic()
-    print("✅ GenAI analyzer tests passed")
-    
-    # Run ADF client tests
-    print("\n📡 Testing ADF Client...")
-    adf_test = TestADFClient()
-    adf_test.setup_method()
-    adf_test.test_mock_data_generation()
-    adf_test.test_get_pipeline_runs()
-    print("✅ ADF client tests passed")
-    
-    # Run mock data generator tests
-    print("\n🎭 Testing Mock Data Generator...")
-    mock_test = TestMockDataGenerator()
-    mock_test.setup_method()
-    mock_test.test_generate_pipeline_runs()
-    mock_test.test_generate_genai_responses()
-    print("✅ Mock data generator tests passed")
-    
-    # Run integration tests
-    print("\n🔄 Testing Integration...")
-    integration_test = TestIntegration()
-    integration_test.setup_method()
-    try:
-        integration_test.test_full_pipeline_processing()
-        print("✅ Integration tests passed")
-    finally:
-        integration_test.teardown_method()
-    
-    print("\n🎉 All tests passed successfully!")
-    return True
+def run_pytest() -> int:
+    """Run this suite through pytest, stopping at the first failure; returns the exit code"""
+    args = [__file__, "-x", "-q", "-p", "no:cacheprovider", "--tb=line"]
+    if XDIST_AVAILABLE:
+        # loadscope keeps each class on one worker; every class sets up its own database
+        args += ["-n", "auto", "--dist", "loadscope"]
+    return pytest.main(args)
+
+def run_tests() -> bool:
+    """Run all tests, returning True when they pass"""
+    return run_pytest() == 0
 
 if __name__ == "__main__":
-    run_tests()
+    sys.exit(run_pytest())